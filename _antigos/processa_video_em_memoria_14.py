@@ -28,6 +28,10 @@ DetectorFactory.seed = 0
 # Inicializar o corretor ortográfico para português
 corretor = SpellChecker(language="pt")
 
+# Congelar o dicionário como frozenset: o teste de pertencimento vira um
+# lookup de hash em C, sem passar pela resolução de métodos do SpellChecker
+_pt_words = frozenset(corretor.word_frequency.dictionary)
+
 # Configurar o logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
@@ -44,7 +48,7 @@ def texto_legivel(texto, min_palavra=4):
             return False
 
         # Verificar ortografia das palavras
-        palavras_legiveis = [palavra for palavra in palavras if palavra.lower() in corretor]
+        palavras_legiveis = [palavra for palavra in palavras if palavra.lower() in _pt_words]
 
         if palavras_legiveis:
             # Unir as palavras legíveis para detecção de idioma
@@ -1,279 +1,405 @@
-import os
-import re
-import cv2
-import whisper
-import argparse
-import logging
-import threading
-import glob
-import warnings
-from tqdm import tqdm
-from time import time
-from PIL import Image
-import pytesseract
-from queue import Queue
-import numpy as np
-
-# Suprimir avisos específicos
-warnings.filterwarnings("ignore", category=UserWarning)
-warnings.filterwarnings(
-    "ignore", message="You are using `torch.load` with `weights_only=False`"
-)
-
-# Configurar o logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
-)
-
-def formatar_timestamp_para_nome(timestamp_ms):
-    """Formata o timestamp em milissegundos para o formato HH_MM_SS.FFFF."""
-    try:
-        total_segundos = timestamp_ms / 1000.0
-        horas = int(total_segundos // 3600)
-        minutos = int((total_segundos % 3600) // 60)
-        segundos = int(total_segundos % 60)
-        milissegundos = int((total_segundos - int(total_segundos)) * 10000)
-        return f"{horas:02d}_{minutos:02d}_{segundos:02d}.{milissegundos:04d}"
-    except Exception as e:
-        logging.error(f"Erro ao formatar timestamp para nome: {e}")
-        return "00_00_00.0000"
-
-def detectar_caracteres(frame):
-    """
-    Detecta se há qualquer caractere no frame usando OCR.
-    Retorna True se caracteres forem detectados, False caso contrário.
-    """
-    try:
-        # Converter o frame para escala de cinza
-        imagem_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-        # Aplicar limiarização
-        _, imagem_thresh = cv2.threshold(imagem_gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-
-        # Converter para PIL Image
-        imagem_pil = Image.fromarray(imagem_thresh)
-
-        # Executar OCR
-        configuracao_tesseract = (
-            r"--oem 3 --psm 11"
-        )
-        texto = pytesseract.image_to_string(
-            imagem_pil, config=configuracao_tesseract
-        )
-
-        if texto.strip():
-            return True, texto
-        else:
-            return False 
-    except Exception as e:
-        logging.warning(f"Erro na detecção de caracteres: {e}")
-        return False
-
-def processar_frames_com_opencv(
-    caminho_video, pasta_saida, fps_extracao=4, processa_texto=False
-):
-    """Processa os frames do vídeo usando OpenCV, salva todos os frames e renomeia aqueles com caracteres detectados."""
-    try:
-        cap = cv2.VideoCapture(caminho_video)
-
-        if not cap.isOpened():
-            logging.error(f"Não foi possível abrir o vídeo: {caminho_video}")
-            return
-
-        fps_video = cap.get(cv2.CAP_PROP_FPS)
-        frame_intervalo = int(fps_video / fps_extracao) if fps_extracao else 1
-
-        frame_num = 0
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) / frame_intervalo) 
-        pbar = tqdm(total=total_frames, desc="Processando frames", unit="frame")
-
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            # Obter o timestamp do frame em milissegundos
-            timestamp_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
-
-            # Processar apenas a cada 'frame_intervalo' frames
-            if frame_num % frame_intervalo == 0:
-                try:
-                    # Formatar o timestamp em HH_MM_SS.FFFF
-                    timestamp_formatado = formatar_timestamp_para_nome(timestamp_ms)
-                    # Nome do frame
-                    nome_frame = f"frame_{timestamp_formatado}.png"
-                    caminho_frame_saida = os.path.join(pasta_saida, nome_frame)
-                    # Salvar o frame
-                    cv2.imwrite(caminho_frame_saida, frame)
-
-                    # Detectar caracteres no frame
-                    if processa_texto:
-                        tem_texto, texto_total = detectar_caracteres(frame)
-                        if tem_texto: #detectar_caracteres(frame):
-                            # Renomear o arquivo adicionando '__' antes da extensão
-                            novo_nome_frame = f"frame_{timestamp_formatado}__.png"
-                            novo_caminho_frame_saida = os.path.join(pasta_saida, novo_nome_frame)
-                            os.rename(caminho_frame_saida, novo_caminho_frame_saida)
-                            
-                            # Salvar o texto extraído
-                            caminho_texto_saida = os.path.join(
-                                pasta_saida, f"frame_{timestamp_formatado}__.txt"
-                            )
-                            with open(caminho_texto_saida, "w", encoding="utf-8") as arquivo_texto:
-                                arquivo_texto.write(texto_total.strip())
-
-                    pbar.update(1)
-
-                except Exception as e:
-                    logging.warning(f"Erro ao processar um frame: {e}")
-                    continue
-
-            frame_num += 1
-
-        pbar.close()
-        cap.release()
-    except Exception as e:
-        logging.error(f"Erro ao processar frames com OpenCV: {e}")
-        raise
-
-def transcrever_audio(caminho_video, nome_modelo="medium", idioma="Portuguese"):
-    """Transcreve o áudio do vídeo usando o Whisper."""
-    try:
-        # Suprimir avisos do Whisper
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            modelo_whisper = whisper.load_model(nome_modelo)
-            resultado = modelo_whisper.transcribe(
-                caminho_video, language=idioma, task="transcribe", verbose = True
-            )
-
-        caminho_srt = caminho_video.replace(".mp4", ".srt")
-        caminho_fala_cronometrada = caminho_video.replace(".mp4", "-Fala.Cronometrada.txt")
-
-        with open(caminho_srt, "w", encoding="utf-8") as arquivo_srt:
-            for segmento in resultado["segments"]:
-                inicio = segmento["start"]
-                fim = segmento["end"]
-                texto = segmento["text"].strip()
-
-                arquivo_srt.write(f"{segmento['id']}\n")
-                arquivo_srt.write(
-                    f"{formatar_timestamp(inicio)} --> {formatar_timestamp(fim)}\n"
-                )
-                arquivo_srt.write(f"{texto}\n\n")
-
-        with open(caminho_fala_cronometrada, "w", encoding="utf-8") as arquivo_txt:
-            for segmento in resultado["segments"]:
-                inicio = formatar_timestamp(segmento["start"])
-                texto = segmento["text"].strip()
-                arquivo_txt.write(f"{inicio}: {texto}\n")
-
-        logging.info(
-            f"Arquivos de transcrição gerados: {caminho_srt}, {caminho_fala_cronometrada}"
-        )
-    except Exception as e:
-        logging.error(f"Erro ao transcrever áudio para {caminho_video}: {e}")
-        raise
-
-def formatar_timestamp(segundos):
-    """Formata segundos no formato de timestamp para SRT."""
-    try:
-        horas = int(segundos // 3600)
-        minutos = int((segundos % 3600) // 60)
-        segs = int(segundos % 60)
-        milissegundos = int((segundos - int(segundos)) * 1000)
-        return f"{horas:02d}:{minutos:02d}:{segs:02d},{milissegundos:03d}"
-    except Exception as e:
-        logging.error(f"Erro ao formatar timestamp: {e}")
-        return "00:00:00,000"
-
-def processar_transcricao(caminho_video, nome_modelo, fila_progresso):
-    """Processa a transcrição de áudio."""
-    try:
-        transcrever_audio(caminho_video, nome_modelo=nome_modelo)
-        fila_progresso.put("Transcrição de áudio concluída!")
-    except Exception as e:
-        logging.error(f"Erro no processo de transcrição: {e}")
-        fila_progresso.put(f"Erro na transcrição: {e}")
-
-def main():
-    parser = argparse.ArgumentParser(
-        description="Processa vídeos para extrair frames e gerar legendas com Whisper."
-    )
-    parser.add_argument(
-        "mascara_arquivos",
-        type=str,
-        help="Máscara de arquivos para processamento (ex: '*.mp4').",
-    )
-    parser.add_argument(
-        "--modelo",
-        type=str,
-        default="turbo",
-        help="Modelo Whisper a ser utilizado (padrão: medium).",
-    )
-    parser.add_argument(
-        "--recursivo", action="store_true", help="Busca recursivamente em subdiretórios."
-    )
-    parser.add_argument(
-        "--processa_texto", action="store_true", default=False, help="Busca recursivamente em subdiretórios."
-    )
-    args = parser.parse_args()
-
-    mascara_arquivos = args.mascara_arquivos
-    nome_modelo = args.modelo
-    recursivo = args.recursivo
-    processa_texto = args.processa_texto
-
-    # Encontrar arquivos de vídeo para processar
-    arquivos_video = glob.glob(mascara_arquivos, recursive=recursivo)
-
-    if not arquivos_video:
-        logging.error(f"Nenhum arquivo encontrado com a máscara: {mascara_arquivos}")
-        return
-
-    tempo_inicio = time()
-
-    for caminho_video in arquivos_video:
-        try:
-            # Pasta de saída para frames
-            pasta_video = os.path.dirname(caminho_video)
-            nome_video = os.path.splitext(os.path.basename(caminho_video))[0]
-            pasta_saida = os.path.join(pasta_video, f"frames_{nome_video}")
-            os.makedirs(pasta_saida, exist_ok=True)
-
-            logging.info(f"Processando vídeo: {caminho_video}")
-            logging.info(f"Pasta de saída: {pasta_saida}")
-
-            # Filas para monitorar progresso
-            fila_progresso_transcricao = Queue()
-
-            # Criar e iniciar processos separados
-            processo_frames = threading.Thread(
-                target=processar_frames_com_opencv,
-                args=(caminho_video, pasta_saida, 4,processa_texto),
-            )
-            processo_transcricao = threading.Thread(
-                target=processar_transcricao,
-                args=(caminho_video, nome_modelo, fila_progresso_transcricao),
-            )
-
-            processo_frames.start()
-            processo_transcricao.start()
-
-            # Monitorar progresso
-            while processo_frames.is_alive() or processo_transcricao.is_alive():
-                if not fila_progresso_transcricao.empty():
-                    msg_transcricao = fila_progresso_transcricao.get()
-                    logging.info(f"Transcrição: {msg_transcricao}")
-
-            # Garantir que ambos os processos foram concluídos
-            processo_frames.join()
-            processo_transcricao.join()
-        except Exception as e:
-            logging.error(f"Erro ao processar vídeo {caminho_video}: {e}")
-
-    tempo_total = time() - tempo_inicio
-    logging.info(f"Processo concluído em {tempo_total:.2f} segundos.")
-
-if __name__ == "__main__":
-    main()
+import os
+
+# O OpenMP interno do Tesseract é contraproducente acima de 1 thread; o
+# paralelismo de OCR fica por conta do pool de processos abaixo
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+import re
+import cv2
+import argparse
+import logging
+import multiprocessing
+import threading
+import glob
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from tqdm import tqdm
+from time import time
+import tesserocr
+from multiprocessing import Process, Queue
+from queue import Empty, Queue as FilaEscrita
+import numpy as np
+import torch
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+
+# Suprimir avisos específicos
+warnings.filterwarnings("ignore", category=UserWarning)
+warnings.filterwarnings(
+    "ignore", message="You are using `torch.load` with `weights_only=False`"
+)
+
+# Configurar o logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
+)
+
+def tem_tensor_cores():
+    """Detecta GPU com tensor cores (compute capability >= 7.0)."""
+    return torch.cuda.is_available() and torch.cuda.get_device_capability(0)[0] >= 7
+
+def formatar_timestamp_para_nome(timestamp_ms):
+    """Formata o timestamp em milissegundos para o formato HH_MM_SS.FFFF."""
+    # divmod + formatação com '%' é mais barato que f-string em caminho quente
+    total_segundos = timestamp_ms / 1000.0
+    fracao = int((total_segundos - int(total_segundos)) * 10000)
+    minutos, segundos = divmod(int(total_segundos), 60)
+    horas, minutos = divmod(minutos, 60)
+    return "%02d_%02d_%02d.%04d" % (horas, minutos, segundos, fracao)
+
+# Uma instância de PyTessBaseAPI por processo; nunca reinstanciar por frame
+_api_tesseract = None
+
+def _obter_api_tesseract():
+    global _api_tesseract
+    if _api_tesseract is None:
+        _api_tesseract = tesserocr.PyTessBaseAPI(
+            psm=tesserocr.PSM.SPARSE_TEXT, oem=tesserocr.OEM.DEFAULT
+        )
+    return _api_tesseract
+
+def detectar_caracteres(frame):
+    """
+    Detecta se há qualquer caractere no frame usando OCR.
+    Retorna True se caracteres forem detectados, False caso contrário.
+    """
+    try:
+        # Converter o frame para escala de cinza
+        imagem_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        # Pré-filtro vetorizado: frames de baixa variância (sólidos ou sem
+        # contraste) não contêm texto; o std em NumPy custa microssegundos
+        # contra centenas de ms de uma chamada ao Tesseract
+        pequena = cv2.resize(imagem_gray, (160, 90), interpolation=cv2.INTER_AREA)
+        if pequena.std() < 12:
+            return False, ""
+
+        # Aplicar limiarização
+        _, imagem_thresh = cv2.threshold(imagem_gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+        # Executar OCR direto sobre o buffer NumPy via Leptonica, sem a cópia
+        # PIL, o PNG temporário e o fork de subprocess do pytesseract
+        api = _obter_api_tesseract()
+        api.SetImageBytes(
+            imagem_thresh.tobytes(),
+            imagem_thresh.shape[1],
+            imagem_thresh.shape[0],
+            1,
+            imagem_thresh.shape[1],
+        )
+        texto = api.GetUTF8Text()
+
+        if texto.strip():
+            return True, texto
+        else:
+            return False, ""
+    except Exception as e:
+        logging.warning(f"Erro na detecção de caracteres: {e}")
+        return False, ""
+
+def _drenar_ocr(ocr_pendentes, renomes_adiados, bloquear=False):
+    """Consome os resultados de OCR prontos, renomeando frames com texto."""
+    while ocr_pendentes and (bloquear or ocr_pendentes[0][0].done()):
+        futuro, caminho_frame_saida = ocr_pendentes.popleft()
+        try:
+            tem_texto, texto_total = futuro.result()
+            if tem_texto:
+                # Salvar o texto extraído antes do rename: se o writer ainda
+                # não gravou o JPEG, o texto não se perde junto
+                caminho_texto_saida = caminho_frame_saida.replace(".jpg", "__.txt")
+                with open(caminho_texto_saida, "w", encoding="utf-8") as arquivo_texto:
+                    arquivo_texto.write(texto_total.strip())
+
+                # Renomear o arquivo adicionando '__' antes da extensão; o OCR
+                # pode terminar antes de o writer gravar o JPEG, então renames
+                # que falharem são refeitos depois do join dos writers
+                try:
+                    os.rename(caminho_frame_saida, caminho_frame_saida.replace(".jpg", "__.jpg"))
+                except FileNotFoundError:
+                    renomes_adiados.append(caminho_frame_saida)
+        except Exception as e:
+            logging.warning(f"Erro ao processar resultado de OCR: {e}")
+
+def _gravar_frames_worker(fila_escrita):
+    """Consome pares (caminho, frame) da fila e grava em disco."""
+    while True:
+        item = fila_escrita.get()
+        if item is None:
+            break
+        caminho_frame, frame = item
+        try:
+            # Q85: arquivo bem menor e encode mais rápido, sem perda
+            # perceptível para o OCR em 720p
+            cv2.imwrite(caminho_frame, frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        except Exception as e:
+            logging.warning(f"Erro ao gravar frame {caminho_frame}: {e}")
+
+def processar_frames_com_opencv(
+    caminho_video, pasta_saida, fps_extracao=4, processa_texto=False
+):
+    """Processa os frames do vídeo usando OpenCV, salva todos os frames e renomeia aqueles com caracteres detectados."""
+    try:
+        # Backend FFmpeg explícito com decodificação por hardware (NVDEC etc.)
+        # quando disponível
+        cap = cv2.VideoCapture(
+            caminho_video,
+            cv2.CAP_FFMPEG,
+            [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+        )
+
+        if not cap.isOpened():
+            logging.error(f"Não foi possível abrir o vídeo: {caminho_video}")
+            return
+
+        fps_video = cap.get(cv2.CAP_PROP_FPS)
+        frame_intervalo = int(fps_video / fps_extracao) if fps_extracao else 1
+
+        frame_num = 0
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) / frame_intervalo)
+        pbar = tqdm(total=total_frames, desc="Processando frames", unit="frame")
+
+        # Fila limitada entre decodificação e escrita em disco: put/get
+        # bloqueantes dão backpressure sem polling, e a decodificação não
+        # espera o encode/IO de cada frame
+        fila_escrita = FilaEscrita(maxsize=32)
+        threads_escrita = [
+            threading.Thread(target=_gravar_frames_worker, args=(fila_escrita,))
+            for _ in range(4)
+        ]
+        for thread_escrita in threads_escrita:
+            thread_escrita.start()
+
+        # Hash perceptual para deduplicação: em screencasts a maioria dos
+        # frames amostrados é igual ao anterior e não precisa de encode nem OCR
+        hasher_phash = cv2.img_hash.PHash_create()
+        hash_anterior = None
+
+        # Pool de processos para OCR: Tesseract mono-thread por worker,
+        # um worker por par de núcleos, enquanto o loop segue decodificando
+        pool_ocr = None
+        ocr_pendentes = deque()
+        renomes_adiados = []
+        if processa_texto:
+            pool_ocr = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2))
+
+        try:
+            while True:
+                # grab() avança o demuxer sem pagar a conversão YUV->BGR dos
+                # frames descartados; retrieve() roda só nos frames amostrados
+                if not cap.grab():
+                    break
+
+                # Obter o timestamp do frame em milissegundos
+                timestamp_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+
+                # Processar apenas a cada 'frame_intervalo' frames
+                if frame_num % frame_intervalo == 0:
+                    ret, frame = cap.retrieve()
+                    if not ret:
+                        break
+
+                    try:
+                        # Pular frames quase idênticos ao último salvo (distância
+                        # de Hamming <= 4 no pHash de 64 bits): sem gravação e
+                        # sem nova chamada ao Tesseract
+                        hash_frame = hasher_phash.compute(frame)
+                        if hash_anterior is None or cv2.norm(hash_frame, hash_anterior, cv2.NORM_HAMMING) > 4:
+                            hash_anterior = hash_frame
+
+                            # Formatar o timestamp em HH_MM_SS.FFFF
+                            timestamp_formatado = formatar_timestamp_para_nome(timestamp_ms)
+                            # Nome do frame
+                            # JPEG em vez de PNG: evita a compressão zlib na CPU, que
+                            # domina o custo do loop de extração a 4 fps
+                            nome_frame = f"frame_{timestamp_formatado}.jpg"
+                            caminho_frame_saida = os.path.join(pasta_saida, nome_frame)
+                            # Enfileirar a gravação do frame (writers em background)
+                            fila_escrita.put((caminho_frame_saida, frame))
+
+                            # Detectar caracteres no frame em paralelo, sem bloquear
+                            # a decodificação
+                            if processa_texto:
+                                futuro = pool_ocr.submit(detectar_caracteres, frame)
+                                ocr_pendentes.append((futuro, caminho_frame_saida))
+                                _drenar_ocr(ocr_pendentes, renomes_adiados)
+
+                        pbar.update(1)
+
+                    except Exception as e:
+                        logging.warning(f"Erro ao processar um frame: {e}")
+                        continue
+
+                frame_num += 1
+
+        finally:
+            # Encerramento no finally: se a decodificação falhar, os writers
+            # precisam receber os sentinelas mesmo assim, senão ficam presos
+            # no get() e o processo nunca termina
+            for _ in threads_escrita:
+                fila_escrita.put(None)
+            for thread_escrita in threads_escrita:
+                thread_escrita.join()
+
+            # Aguardar os OCRs ainda em andamento; com os writers encerrados,
+            # todos os JPEGs estão em disco e os renames adiados funcionam
+            _drenar_ocr(ocr_pendentes, renomes_adiados, bloquear=True)
+            for caminho_frame_saida in renomes_adiados:
+                try:
+                    os.rename(caminho_frame_saida, caminho_frame_saida.replace(".jpg", "__.jpg"))
+                except Exception as e:
+                    logging.warning(f"Erro ao renomear frame {caminho_frame_saida}: {e}")
+            if pool_ocr is not None:
+                pool_ocr.shutdown()
+
+            pbar.close()
+            cap.release()
+    except Exception as e:
+        logging.error(f"Erro ao processar frames com OpenCV: {e}")
+        raise
+
+def transcrever_audio(caminho_video, nome_modelo="medium", idioma="pt"):
+    """Transcreve o áudio do vídeo usando o Faster-Whisper (CTranslate2, int8)."""
+    try:
+        # Suprimir avisos do Whisper
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            modelo_whisper = WhisperModel(
+                nome_modelo,
+                device="cuda" if torch.cuda.is_available() else "cpu",
+                compute_type="int8_float16" if tem_tensor_cores() else "int8",
+            )
+            pipeline = BatchedInferencePipeline(model=modelo_whisper)
+            # vad_filter pula trechos de silêncio antes da transcrição
+            segmentos, info = pipeline.transcribe(
+                caminho_video, batch_size=16, language=idioma, vad_filter=True
+            )
+
+        caminho_srt = caminho_video.replace(".mp4", ".srt")
+        caminho_fala_cronometrada = caminho_video.replace(".mp4", "-Fala.Cronometrada.txt")
+
+        # 'segmentos' é um gerador: escrever os dois arquivos em uma única passada
+        with open(caminho_srt, "w", encoding="utf-8") as arquivo_srt, \
+             open(caminho_fala_cronometrada, "w", encoding="utf-8") as arquivo_txt:
+            for segmento in segmentos:
+                inicio = segmento.start
+                fim = segmento.end
+                texto = segmento.text.strip()
+
+                arquivo_srt.write(f"{segmento.id}\n")
+                arquivo_srt.write(
+                    f"{formatar_timestamp(inicio)} --> {formatar_timestamp(fim)}\n"
+                )
+                arquivo_srt.write(f"{texto}\n\n")
+
+                arquivo_txt.write(f"{formatar_timestamp(inicio)}: {texto}\n")
+
+        logging.info(
+            f"Arquivos de transcrição gerados: {caminho_srt}, {caminho_fala_cronometrada}"
+        )
+    except Exception as e:
+        logging.error(f"Erro ao transcrever áudio para {caminho_video}: {e}")
+        raise
+
+def formatar_timestamp(segundos):
+    """Formata segundos no formato de timestamp para SRT."""
+    milissegundos = int((segundos - int(segundos)) * 1000)
+    minutos, segs = divmod(int(segundos), 60)
+    horas, minutos = divmod(minutos, 60)
+    return "%02d:%02d:%02d,%03d" % (horas, minutos, segs, milissegundos)
+
+def processar_transcricao(caminho_video, nome_modelo, fila_progresso):
+    """Processa a transcrição de áudio."""
+    try:
+        transcrever_audio(caminho_video, nome_modelo=nome_modelo)
+        fila_progresso.put("Transcrição de áudio concluída!")
+    except Exception as e:
+        logging.error(f"Erro no processo de transcrição: {e}")
+        fila_progresso.put(f"Erro na transcrição: {e}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Processa vídeos para extrair frames e gerar legendas com Whisper."
+    )
+    parser.add_argument(
+        "mascara_arquivos",
+        type=str,
+        help="Máscara de arquivos para processamento (ex: '*.mp4').",
+    )
+    parser.add_argument(
+        "--modelo",
+        type=str,
+        default="turbo",
+        help="Modelo Whisper a ser utilizado (padrão: medium).",
+    )
+    parser.add_argument(
+        "--recursivo", action="store_true", help="Busca recursivamente em subdiretórios."
+    )
+    parser.add_argument(
+        "--processa_texto", action="store_true", default=False, help="Busca recursivamente em subdiretórios."
+    )
+    args = parser.parse_args()
+
+    mascara_arquivos = args.mascara_arquivos
+    nome_modelo = args.modelo
+    recursivo = args.recursivo
+    processa_texto = args.processa_texto
+
+    # Encontrar arquivos de vídeo para processar
+    arquivos_video = glob.glob(mascara_arquivos, recursive=recursivo)
+
+    if not arquivos_video:
+        logging.error(f"Nenhum arquivo encontrado com a máscara: {mascara_arquivos}")
+        return
+
+    tempo_inicio = time()
+
+    for caminho_video in arquivos_video:
+        try:
+            # Pasta de saída para frames
+            pasta_video = os.path.dirname(caminho_video)
+            nome_video = os.path.splitext(os.path.basename(caminho_video))[0]
+            pasta_saida = os.path.join(pasta_video, f"frames_{nome_video}")
+            os.makedirs(pasta_saida, exist_ok=True)
+
+            logging.info(f"Processando vídeo: {caminho_video}")
+            logging.info(f"Pasta de saída: {pasta_saida}")
+
+            # Filas para monitorar progresso
+            fila_progresso_transcricao = Queue()
+
+            # Criar e iniciar processos separados: OCR/OpenCV e Whisper são
+            # CPU-bound e disputariam o GIL em threads; Process dá paralelismo
+            # real e o modelo Whisper é carregado dentro do filho (sem fork de
+            # contexto CUDA)
+            processo_frames = Process(
+                target=processar_frames_com_opencv,
+                args=(caminho_video, pasta_saida, 4, processa_texto),
+            )
+            processo_transcricao = Process(
+                target=processar_transcricao,
+                args=(caminho_video, nome_modelo, fila_progresso_transcricao),
+            )
+
+            processo_frames.start()
+            processo_transcricao.start()
+
+            # Monitorar progresso com get bloqueante (sem busy-wait na fila)
+            while processo_frames.is_alive() or processo_transcricao.is_alive():
+                try:
+                    msg_transcricao = fila_progresso_transcricao.get(timeout=0.5)
+                    logging.info(f"Transcrição: {msg_transcricao}")
+                except Empty:
+                    pass
+
+            # Garantir que ambos os processos foram concluídos
+            processo_frames.join()
+            processo_transcricao.join()
+        except Exception as e:
+            logging.error(f"Erro ao processar vídeo {caminho_video}: {e}")
+
+    tempo_total = time() - tempo_inicio
+    logging.info(f"Processo concluído em {tempo_total:.2f} segundos.")
+
+if __name__ == "__main__":
+    multiprocessing.set_start_method("spawn", force=True)
+    main()
@@ -1,531 +1,710 @@
-import os
-import re
-import shutil
-import subprocess
-import tempfile
-import warnings
-import argparse
-import glob
-import logging
-from tqdm import tqdm
-from time import time
-from multiprocessing import Process, Queue, set_start_method
-from faster_whisper import WhisperModel
-import torch  # Import torch to check for GPU availability
-from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer  # Import for translation
-
-# Import Tkinter modules
-import tkinter as tk
-from tkinter import ttk
-from tkinter import messagebox
-
-# Import ttkthemes for theming
-from ttkthemes import ThemedTk
-
-# Set multiprocessing start method to 'spawn'
-set_start_method('spawn', force=True)
-
-# Configurar o logging para verbosidade máxima
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s [%(levelname)s] %(message)s')
-
-# Check CUDA version and device properties
-if torch.cuda.is_available():
-    cuda_version = torch.version.cuda
-    device_name = torch.cuda.get_device_name(0)
-    logging.info(f"CUDA Version: {cuda_version}")
-    logging.info(f"CUDA Device: {device_name}")
-else:
-    logging.warning("CUDA is not available. The script will run on CPU.")
-
-print("")
-print("===============================================================================================")
-print("")
-
-
-def extrair_frames(caminho_video, pasta_saida, fps=4, resolucao="1280:720"):
-    """Extrai frames do vídeo usando ffmpeg e coleta timestamps."""
-    try:
-        padrao_frame = os.path.join(pasta_saida, "frame_%06d.png")
-        comando = [
-            "ffmpeg", "-i", caminho_video, "-vf", f"fps={fps},scale={resolucao},showinfo", padrao_frame
-        ]
-
-        processo = subprocess.Popen(comando, stderr=subprocess.PIPE, text=True)
-        dados_log = []
-
-        for linha in tqdm(processo.stderr, desc="Extraindo frames", unit="linha"):
-            if "pts_time" in linha:
-                dados_log.append(linha)
-
-        processo.wait(timeout=300)  # Timeout de 5 minutos
-
-        if processo.returncode != 0:
-            raise RuntimeError("Erro ao processar o vídeo com ffmpeg. Código de retorno diferente de zero.")
-
-        return dados_log
-    except subprocess.TimeoutExpired:
-        logging.error(f"Processo do ffmpeg excedeu o tempo limite para {caminho_video}.")
-        raise
-    except Exception as e:
-        logging.error(f"Erro ao extrair frames: {e}", exc_info=True)
-        raise
-
-def analisar_dados_log(dados_log):
-    """Analisa os logs do ffmpeg para obter timestamps de cada frame."""
-    tempos_frames = []
-    try:
-        for linha in dados_log:
-            match = re.search(r'pts_time:([0-9.]+)', linha)
-            if match:
-                timestamp = float(match.group(1))
-                minutos = int(timestamp // 60)
-                segundos = int(timestamp % 60)
-                milissegundos = int((timestamp - int(timestamp)) * 1000)
-                tempos_frames.append((minutos, segundos, milissegundos))
-    except Exception as e:
-        logging.error(f"Erro ao analisar dados do log: {e}")
-        raise
-
-    return tempos_frames
-
-def renomear_frames(tempos_frames, pasta_saida, nome_base):
-    """Renomeia frames com base nos timestamps extraídos."""
-    try:
-        for i, (minutos, segundos, milissegundos) in enumerate(tqdm(tempos_frames, desc="Renomeando frames", unit="frame")):
-            nome_original = os.path.join(pasta_saida, f"frame_{i+1:06d}.png")
-            nome_novo = os.path.join(pasta_saida, f"frame_{nome_base}_{minutos:02d}-{segundos:02d}-{milissegundos:03d}.png")
-
-            if os.path.exists(nome_original):
-                os.rename(nome_original, nome_novo)
-            else:
-                logging.warning(f"Arquivo {nome_original} não encontrado. Pulando...")
-    except Exception as e:
-        logging.error(f"Erro ao renomear frames: {e}")
-        raise
-
-def processar_frames(caminho_video, pasta_saida, fila_progresso):
-    """Processa frames: extração e renomeação."""
-    try:
-        # Extrair nome base do vídeo
-        nome_base = os.path.splitext(os.path.basename(caminho_video))[0]
-
-        # Extrair frames
-        dados_log = extrair_frames(caminho_video, pasta_saida)
-        tempos_frames = analisar_dados_log(dados_log)
-
-        # Renomear frames
-        renomear_frames(tempos_frames, pasta_saida, nome_base)
-
-        # Send progress updates to the queue
-        total_frames = len(tempos_frames)
-        for i, (minutos, segundos, milissegundos) in enumerate(tqdm(tempos_frames, desc="Renomeando frames", unit="frame")):
-            # ...existing renaming code...
-            progress = (i + 1) / total_frames
-            fila_progresso.put(progress)
-        fila_progresso.put("Processamento de frames concluído!")
-    except Exception as e:
-        logging.error(f"Erro ao processar frames para {caminho_video}: {e}")
-        fila_progresso.put(f"Erro ao processar frames: {e}")
-
-
-def transcrever_audio_faster_whisper(caminho_audio, nome_modelo="large-v3", idioma=None, fila_progresso=None):
-    """Transcreve áudio do vídeo ou arquivo MP3 usando o Faster-Whisper."""
-    try:
-        logging.info("Iniciando Transcrição do áudio usando o Faster-Whisper")
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        modelo_whisper = WhisperModel(model_size_or_path=nome_modelo, device=device, compute_type="int8")
-        logging.debug(f"Modelo {nome_modelo} carregado com sucesso.")
-
-        base_path = caminho_audio.rsplit(".", 1)[0]
-        detected_language = None
-        arquivos = {}
-
-        # Iniciar transcrição e obter gerador de segmentos
-        resultado = modelo_whisper.transcribe(caminho_audio, beam_size=5, language=idioma)
-        generator = resultado[0]
-        info = resultado[1]
-
-        detected_language = info.language
-        logging.info(f"Linguagem detectada: {detected_language}")
-
-        if detected_language == "en":
-            # Arquivos para transcrição em inglês e português
-            arquivos['srt_en'] = open(f"{base_path}-en.srt", "w", encoding="utf-8")
-            arquivos['fala_cron_en'] = open(f"{base_path}-en-Fala.Cronometrada.txt", "w", encoding="utf-8")
-            arquivos['srt'] = open(f"{base_path}.srt", "w", encoding="utf-8")
-            arquivos['fala_cron'] = open(f"{base_path}-Fala.Cronometrada.txt", "w", encoding="utf-8")
-            # Carregar modelo de tradução
-            arquivos['tokenizer'] = M2M100Tokenizer.from_pretrained("facebook/m2m100_418M")
-            arquivos['translation_model'] = M2M100ForConditionalGeneration.from_pretrained("facebook/m2m100_1.2B").to(device)
-            arquivos['tokenizer'].src_lang = "en"
-        else:
-            # Arquivos para transcri��ão no idioma detectado
-            arquivos['srt'] = open(f"{base_path}.srt", "w", encoding="utf-8")
-            arquivos['fala_cron'] = open(f"{base_path}-Fala.Cronometrada.txt", "w", encoding="utf-8")
-
-        segment_id = 1
-        total_segments = len(list(modelo_whisper.transcribe(caminho_audio, beam_size=5, language=idioma)[0]))
-        generator = modelo_whisper.transcribe(caminho_audio, beam_size=5, language=idioma)[0]
-        segment_id = 1
-        for segmento in generator:
-            inicio = segmento.start
-            fim = segmento.end
-            texto = segmento.text.strip()
-
-            if detected_language == "en":
-                # Salvar segmento em inglês
-                arquivos['srt_en'].write(f"{segment_id}\n")
-                arquivos['srt_en'].write(f"{formatar_timestamp(inicio)} --> {formatar_timestamp(fim)}\n")
-                arquivos['srt_en'].write(f"{texto}\n\n")
-                arquivos['fala_cron_en'].write(f"{formatar_timestamp(inicio)}: {texto}\n")
-
-                # Traduzir e salvar em português
-                encoded = arquivos['tokenizer'](texto, return_tensors="pt").to(device)
-                generated_tokens = arquivos['translation_model'].generate(**encoded, forced_bos_token_id=arquivos['tokenizer'].get_lang_id("pt"))
-                texto_traduzido = arquivos['tokenizer'].batch_decode(generated_tokens, skip_special_tokens=True)[0]
-
-                arquivos['srt'].write(f"{segment_id}\n")
-                arquivos['srt'].write(f"{formatar_timestamp(inicio)} --> {formatar_timestamp(fim)}\n")
-                arquivos['srt'].write(f"{texto_traduzido}\n\n")
-                arquivos['fala_cron'].write(f"{formatar_timestamp(inicio)}: {texto_traduzido}\n")
-
-                logging.info(f"Segmento {segment_id}: {formatar_timestamp(inicio)} --> {formatar_timestamp(fim)} {texto} | pt='{texto_traduzido}'")
-            else:
-                # Salvar segmento no idioma detectado
-                arquivos['srt'].write(f"{segment_id}\n")
-                arquivos['srt'].write(f"{formatar_timestamp(inicio)} --> {formatar_timestamp(fim)}\n")
-                arquivos['srt'].write(f"{texto}\n\n")
-                arquivos['fala_cron'].write(f"{formatar_timestamp(inicio)}: {texto}\n")
-
-                logging.info(f"Segmento {segment_id}: {formatar_timestamp(inicio)} --> {formatar_timestamp(fim)} {texto}")
-
-            if fila_progresso:
-                progress = segment_id / total_segments
-                fila_progresso.put(progress)
-            segment_id += 1
-
-        # Fechar arquivos abertos
-        for arquivo in arquivos.values():
-            if hasattr(arquivo, 'close'):
-                arquivo.close()
-
-        logging.info("Arquivos de transcrição gerados.")
-    except Exception as e:
-        logging.error(f"Erro ao transcrever áudio para {caminho_audio}: {e}", exc_info=True)
-        raise
-    finally:
-        # Liberar recursos e limpar memória
-        del modelo_whisper
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
-        logging.info("Memória liberada após transcrição.")
-
-def salvar_transcricao(segmentos, caminho_srt, caminho_fala_cronometrada):
-    """Salva os segmentos transcritos em arquivos SRT e de Fala Cronometrada."""
-    try:
-        with open(caminho_srt, "w", encoding="utf-8") as arquivo_srt:
-            with open(caminho_fala_cronometrada, "w", encoding="utf-8") as arquivo_txt:
-                for segmento in segmentos:
-                    inicio = segmento.start
-                    fim = segmento.end
-                    texto = segmento.text.strip()
-
-                    logging.info(f"Salvando segmento {segmento.id} {formatar_timestamp(inicio)} --> {formatar_timestamp(fim)} {texto}")
-
-                    # Arquivo SRT
-                    arquivo_srt.write(f"{segmento.id}\n")
-                    arquivo_srt.write(f"{formatar_timestamp(inicio)} --> {formatar_timestamp(fim)}\n")
-                    arquivo_srt.write(f"{texto}\n\n")
-
-                    # Arquivo de texto Fala Cronometrada
-                    arquivo_txt.write(f"{formatar_timestamp(inicio)}: {texto}\n")
-    except Exception as e:
-        logging.error(f"Erro ao salvar transcrição: {e}", exc_info=True)
-        raise
-
-def formatar_timestamp(segundos):
-    """Formata segundos no formato de timestamp para SRT."""
-    try:
-        horas = int(segundos // 3600)
-        minutos = int((segundos % 3600) // 60)
-        segs = int(segundos % 60)
-        milissegundos = int((segundos - int(segundos)) * 1000)
-        return f"{horas:02d}:{minutos:02d}:{segs:02d},{milissegundos:03d}"
-    except Exception as e:
-        logging.error(f"Erro ao formatar timestamp: {e}")
-        return "00:00:00,000"
-
-def processar_transcricao(caminho_video, nome_modelo, fila_progresso):
-    """Processa a transcrição de áudio."""
-    try:
-        transcrever_audio_faster_whisper(caminho_video, nome_modelo=nome_modelo, fila_progresso=fila_progresso)
-        fila_progresso.put("Transcrição de áudio concluída!")
-    except Exception as e:
-        logging.error(f"Erro no processo de transcrição: {e}", exc_info=True)
-        fila_progresso.put(f"Erro na transcrição: {e}")
-
-
-def encontrar_arquivos_mascara(mascara, recursivo):
-    """Encontra arquivos com base na máscara fornecida, mesmo em subpastas vazias."""
-    try:
-        if (recursivo):
-            # Usar "**/" para garantir busca recursiva por todas as subpastas
-            caminho_completo = os.path.join("**", mascara)  # Exemplo: '**/*.mp4'
-            return glob.glob(caminho_completo, recursive=True)
-        else:
-            return glob.glob(mascara)
-    except Exception as e:
-        logging.error(f"Erro ao encontrar arquivos com a máscara {mascara}: {e}")
-        return []
-
-def formatar_tempo_humano(tempo_segundos):
-    """Formata o tempo em horas, minutos e segundos."""
-    horas = int(tempo_segundos // 3600)
-    minutos = int((tempo_segundos % 3600) // 60)
-    segundos = int(tempo_segundos % 60)
-    
-    partes = []
-    if horas > 0:
-        partes.append(f"{horas} horas")
-    if minutos > 0:
-        partes.append(f"{minutos} minutos")
-    if segundos > 0 or not partes:
-        partes.append(f"{segundos} segundos")
-    
-    return ", ".join(partes)
-
-
-def main():
-    parser = argparse.ArgumentParser(description="Processa vídeos e áudios para extrair frames e gerar legendas com Faster-Whisper.")
-    parser.add_argument("mascara_arquivos", type=str, nargs='?', help="Máscara de arquivos para processamento (ex: *.mp4, *.mp3).")
-    parser.add_argument("--modelo", type=str, default="large-v3", help="Modelo Whisper a ser utilizado (padrão: small).")
-    parser.add_argument("--recursivo", action="store_true", help="Busca recursivamente em subdiretórios.")
-    parser.add_argument("--pasta_saida", type=str, help="Pasta de saída para armazenar frames.")
-    parser.add_argument("--desativar-frames", action="store_true", help="Desativa o processamento de frames.")
-    parser.add_argument("--skip-transcricao", action="store_true", help="Pula o processo de transcrição.")
-    parser.add_argument("--skip-prontos", action="store_true", help="Pula arquivos já processados com '-Fala.Cronometrada.txt' maior que 1KB.")
-    
-    # Add new argument --no-interactive
-    parser.add_argument("--no-interactive", action="store_true", help="Executa o programa sem a interface gráfica.")
-
-    args = parser.parse_args()
-
-    if not args.no_interactive:
-        # If --no-interactive is not specified, show GUI to get parameters
-
-        def submit_parameters():
-            args.mascara_arquivos = entry_mascara_arquivos.get()
-            args.modelo = entry_modelo.get()
-            args.recursivo = var_recursivo.get()
-            args.pasta_saida = entry_pasta_saida.get() if entry_pasta_saida.get() else None
-            args.desativar_frames = var_desativar_frames.get()
-            args.skip_prontos = var_skip_prontos.get()
-            args.skip_transcricao = var_skip_transcricao.get()
-            root.destroy()
-
-        # Alterar o tema da janela principal
-        root = ThemedTk(theme="radiance")  # Novo tema para a janela de configuração
-        root.title("Configurações do Programa")
-        style = ttk.Style(root)
-        style.theme_use('radiance')  # Aplicar o novo tema
-
-        # Input fields for parameters
-        tk.Label(root, text="Máscara de Arquivos:").grid(row=0, column=0, sticky="e")
-        entry_mascara_arquivos = tk.Entry(root, width=50)
-        entry_mascara_arquivos.grid(row=0, column=1)
-        entry_mascara_arquivos.insert(0, args.mascara_arquivos if args.mascara_arquivos else "*.mp4")
-
-        tk.Label(root, text="Modelo Whisper:").grid(row=1, column=0, sticky="e")
-        entry_modelo = tk.Entry(root, width=50)
-        entry_modelo.grid(row=1, column=1)
-        entry_modelo.insert(0, args.modelo)
-
-        var_recursivo = tk.BooleanVar(value=args.recursivo)
-        tk.Checkbutton(root, text="Busca Recursiva", variable=var_recursivo).grid(row=2, column=1, sticky="w")
-
-        tk.Label(root, text="Pasta de Saída:").grid(row=3, column=0, sticky="e")
-        entry_pasta_saida = tk.Entry(root, width=50)
-        entry_pasta_saida.grid(row=3, column=1)
-        if args.pasta_saida:
-            entry_pasta_saida.insert(0, args.pasta_saida)
-
-        var_desativar_frames = tk.BooleanVar(value=args.desativar_frames)
-        tk.Checkbutton(root, text="Desativar Frames", variable=var_desativar_frames).grid(row=4, column=1, sticky="w")
-
-        var_skip_prontos = tk.BooleanVar(value=args.skip_prontos)
-        tk.Checkbutton(root, text="Pular Arquivos Prontos", variable=var_skip_prontos).grid(row=5, column=1, sticky="w")
-        
-        var_skip_transcricao = tk.BooleanVar(value=args.skip_transcricao if hasattr(args, 'skip_transcricao') else False)
-        tk.Checkbutton(root, text="Pular Transcrição", variable=var_skip_transcricao).grid(row=6, column=1, sticky="w")
-        
-        # Ajuste o número da linha para o botão "Iniciar"
-        tk.Button(root, text="Iniciar", command=submit_parameters).grid(row=7, column=1)
-
-        root.mainloop()
-
-    # Criar a janela de progresso com o novo tema
-    progress_root = ThemedTk(theme="radiance")  # Novo tema para a janela de progresso
-    progress_root.title("Progresso")
-    style = ttk.Style(progress_root)
-    style.theme_use('radiance')  # Aplicar o novo tema
-
-    # Elementos da GUI
-    tk.Label(progress_root, text="Arquivo Atual:").grid(row=0, column=0, sticky="w")
-    arquivo_label = tk.Label(progress_root, text="", font=("Arial", 12, "bold"))
-    arquivo_label.grid(row=0, column=1, sticky="w")
-
-    tk.Label(progress_root, text="Processamento de Frames:").grid(row=1, column=0, sticky="w")
-    progress_bar_frames = ttk.Progressbar(progress_root, length=400)
-    progress_bar_frames.grid(row=1, column=1)
-
-    tk.Label(progress_root, text="Transcrição de Áudio:").grid(row=2, column=0, sticky="w")
-    progress_bar_transcricao = ttk.Progressbar(progress_root, length=400)
-    progress_bar_transcricao.grid(row=2, column=1)
-
-    tk.Label(progress_root, text="Logs:").grid(row=3, column=0, sticky="nw")
-    log_label = tk.Label(progress_root, text="", justify="left", anchor="w")
-    log_label.grid(row=3, column=1, sticky="w")
-
-    # Custom logging handler to update GUI label
-    class TkinterHandler(logging.Handler):
-        def __init__(self, label):
-            super().__init__()
-            self.label = label
-
-        def emit(self, record):
-            msg = self.format(record)
-            level = record.levelname
-            message = f"[{level}] {msg}"
-            self.label.config(text=message)
-            self.label.update_idletasks()
-            self.label.update_idletasks()
-
-    logger = logging.getLogger()
-
-    # Do not remove existing handlers
-    # Remove the loop that removes existing handlers
-    # for handler in logger.handlers[:]:
-    #     logger.removeHandler(handler)
-
-    # Add the TkinterHandler to the logger
-    logger.addHandler(TkinterHandler(log_label))
-
-    # Set the logging level as needed
-    logger.setLevel(logging.DEBUG)
-
-    # Filas para monitorar progresso
-    fila_progresso_transcricao = Queue()
-    fila_progresso_frames = Queue()
-    fila_progresso_arquivo = Queue()  # Nova fila para o arquivo atual
-
-    # Função para atualizar a GUI periodicamente
-    def update_gui():
-        # Atualizar o nome do arquivo atual
-        if not fila_progresso_arquivo.empty():
-            current_file = fila_progresso_arquivo.get()
-            arquivo_label.config(text=current_file)
-
-        # Check progress queues
-        if not fila_progresso_frames.empty():
-            msg_frames = fila_progresso_frames.get()
-            if isinstance(msg_frames, float):
-                progress_bar_frames['value'] = msg_frames * 100
-            else:
-                log_label.config(text=msg_frames)
-
-        if not fila_progresso_transcricao.empty():
-            msg_transcricao = fila_progresso_transcricao.get()
-            if isinstance(msg_transcricao, float):
-                progress_bar_transcricao['value'] = msg_transcricao * 100
-            else:
-                log_label.config(text=msg_transcricao)
-
-        # Schedule next check
-        progress_root.after(100, update_gui)
-
-    # Start updating the GUI
-    update_gui()
-
-    # Start processing in a separate thread to avoid blocking the GUI
-    import threading
-    processing_thread = threading.Thread(target=process_files, args=(args, fila_progresso_transcricao, fila_progresso_frames, fila_progresso_arquivo))
-    processing_thread.start()
-
-    # Start the main event loop
-    progress_root.mainloop()
-
-def process_files(args, fila_progresso_transcricao, fila_progresso_frames, fila_progresso_arquivo):
-    # Verificar se GPU está disponível
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    logging.debug(f"Usando dispositivo: {device}")
-
-    if device == "cuda":
-        # Resetar o dispositivo CUDA
-        torch.cuda.empty_cache()
-        torch.cuda.reset_peak_memory_stats()
-
-    # Usar a pasta do arquivo processado se pasta_saida não for fornecida
-    for caminho_arquivo in encontrar_arquivos_mascara(args.mascara_arquivos, args.recursivo):
-        try:
-            # Enviar o nome do arquivo atual para a fila
-            fila_progresso_arquivo.put(caminho_arquivo)
-
-            # Verificar se o arquivo correspondente de fala cronometrada já existe e tem mais de 1KB
-            caminho_fala_cronometrada = caminho_arquivo.replace(".mp4", "-Fala.Cronometrada.txt").replace(".mp3", "-Fala.Cronometrada.txt")
-
-            if args.skip_prontos and os.path.exists(caminho_fala_cronometrada) and os.path.getsize(caminho_fala_cronometrada) > 1024:
-                logging.info(f"Pulado: '{caminho_arquivo}', arquivo de fala cronometrada '{caminho_fala_cronometrada}' já existe e é maior que 1KB.")
-                continue  # Pular para o próximo arquivo
-
-            if args.pasta_saida:
-                pasta_saida = args.pasta_saida
-            else:
-                pasta_saida = os.path.dirname(caminho_arquivo)  # mesma pasta do arquivo processado
-
-            pasta_saida = os.path.join(pasta_saida, os.path.splitext(os.path.basename(caminho_arquivo))[0])
-            os.makedirs(pasta_saida, exist_ok=True)
-
-            logging.info(f"Processando arquivo: {caminho_arquivo}")
-            logging.info(f"Pasta de saída: {pasta_saida}")
-
-            if not args.skip_transcricao:
-                # Criar e iniciar processo de transcrição
-                processo_transcricao = Process(target=processar_transcricao, args=(caminho_arquivo, args.modelo, fila_progresso_transcricao))
-                processo_transcricao.start()
-            else:
-                logging.info("Processo de transcrição pulado.")
-
-            # Iniciar processo de frames apenas se não estiver desativado e for um vídeo
-            if not args.desativar_frames and caminho_arquivo.endswith(".mp4"):
-                processo_frames = Process(target=processar_frames, args=(caminho_arquivo, pasta_saida, fila_progresso_frames))
-                processo_frames.start()
-            else:
-                logging.info("Processamento de frames desativado ou não aplicável.")
-
-            # Monitorar progresso
-            while ((not args.skip_transcricao and processo_transcricao.is_alive()) or
-                   (not args.desativar_frames and caminho_arquivo.endswith(".mp4") and processo_frames.is_alive())):
-                if not args.desativar_frames and caminho_arquivo.endswith(".mp4") and not fila_progresso_frames.empty():
-                    msg_frames = fila_progresso_frames.get()
-                    logging.info(f"Frames: {msg_frames}")
-
-                if not fila_progresso_transcricao.empty():
-                    msg_transcricao = fila_progresso_transcricao.get()
-                    logging.info(f"Transcrição: {msg_transcricao}")
-
-            # Garantir que ambos os processos foram concluídos
-            if not args.skip_transcricao:
-                processo_transcricao.join()
-            if not args.desativar_frames and caminho_arquivo.endswith(".mp4"):
-                processo_frames.join()
-
-        except Exception as e:
-            logging.error(f"Erro ao processar arquivo {caminho_arquivo}: {e}")
-
-    tempo_total = time() - tempo_inicio
-    tempo_formatado = formatar_tempo_humano(tempo_total)
-    logging.info(f"Processo concluído em {tempo_formatado}.")
-
-if __name__ == "__main__":
-    tempo_inicio = time()  # Capturar o tempo de início antes da execução principal
-    main()
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import warnings
+import argparse
+import fnmatch
+import functools
+import logging
+import numpy as np
+from tqdm import tqdm
+from time import perf_counter
+from multiprocessing import Process, Queue, set_start_method
+from queue import Empty
+from faster_whisper import WhisperModel
+import torch  # Import torch to check for GPU availability
+from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer  # Import for translation
+
+# Import Tkinter modules
+import tkinter as tk
+from tkinter import ttk
+from tkinter import messagebox
+
+# Import ttkthemes for theming
+from ttkthemes import ThemedTk
+
+# Set multiprocessing start method to 'spawn'
+set_start_method('spawn', force=True)
+
+# Configurar o logging para verbosidade máxima
+logging.basicConfig(level=logging.DEBUG, format='%(asctime)s [%(levelname)s] %(message)s')
+
+# Check CUDA version and device properties
+if torch.cuda.is_available():
+    cuda_version = torch.version.cuda
+    device_name = torch.cuda.get_device_name(0)
+    logging.info(f"CUDA Version: {cuda_version}")
+    logging.info(f"CUDA Device: {device_name}")
+else:
+    logging.warning("CUDA is not available. The script will run on CPU.")
+
+print("")
+print("===============================================================================================")
+print("")
+
+# Regex do showinfo compilada uma única vez no escopo do módulo
+_PTS_RE = re.compile(r'pts_time:([0-9.]+)')
+
+
+def extrair_frames(caminho_video, pasta_saida, fps=4, resolucao="1280:720"):
+    """Extrai frames do vídeo usando ffmpeg e coleta timestamps."""
+    try:
+        padrao_frame = os.path.join(pasta_saida, "frame_%06d.png")
+        # -hwaccel auto: decodifica na GPU (NVDEC/VAAPI/VideoToolbox) quando
+        # houver suporte e cai para decode por software caso contrário; a
+        # extração de frames H.264/HEVC é limitada pelo decoder, não pelos filtros
+        comando = [
+            "ffmpeg", "-hwaccel", "auto", "-i", caminho_video, "-vf", f"fps={fps},scale={resolucao},showinfo", padrao_frame
+        ]
+
+        processo = subprocess.Popen(comando, stderr=subprocess.PIPE)
+        buffer_log = bytearray()
+
+        def _drenar_stderr():
+            # Ler o stderr em blocos grandes numa thread dedicada: o processo
+            # principal não fica preso entre rajadas de decode nem paga um
+            # teste de substring por linha
+            while True:
+                bloco = processo.stderr.read(65536)
+                if not bloco:
+                    break
+                buffer_log.extend(bloco)
+
+        leitor_stderr = threading.Thread(target=_drenar_stderr)
+        leitor_stderr.start()
+
+        processo.wait(timeout=300)  # Timeout de 5 minutos
+        leitor_stderr.join()
+
+        if processo.returncode != 0:
+            raise RuntimeError("Erro ao processar o vídeo com ffmpeg. Código de retorno diferente de zero.")
+
+        # Uma única varredura do regex sobre o buffer contíguo
+        return _PTS_RE.findall(buffer_log.decode("utf-8", errors="ignore"))
+    except subprocess.TimeoutExpired:
+        logging.error(f"Processo do ffmpeg excedeu o tempo limite para {caminho_video}.")
+        raise
+    except Exception as e:
+        logging.error(f"Erro ao extrair frames: {e}", exc_info=True)
+        raise
+
+def analisar_dados_log(dados_log):
+    """Converte os timestamps pts_time extraídos do log do ffmpeg."""
+    try:
+        tempos_pts = [float(ts) for ts in dados_log]
+        if not tempos_pts:
+            return []
+
+        # Converter em lote com NumPy: dois divmod sobre milissegundos
+        # inteiros em vez de aritmética escalar por linha
+        total_ms = (np.asarray(tempos_pts, dtype=np.float64) * 1000).astype(np.int64)
+        minutos, resto_ms = np.divmod(total_ms, 60000)
+        segundos, milissegundos = np.divmod(resto_ms, 1000)
+        return list(zip(minutos.tolist(), segundos.tolist(), milissegundos.tolist()))
+    except Exception as e:
+        logging.error(f"Erro ao analisar dados do log: {e}")
+        raise
+
+def renomear_frames(tempos_frames, pasta_saida, nome_base, fila_progresso=None):
+    """Renomeia frames com base nos timestamps extraídos."""
+    try:
+        total_frames = len(tempos_frames)
+        # Um único readdir no lugar de um stat por frame: a existência vira
+        # um lookup O(1) em set e o os.replace dispensa a checagem prévia
+        existentes = set(os.listdir(pasta_saida))
+        # Atualizar a barra e a fila de progresso no máximo ~100 vezes por
+        # passada: um refresh por frame vira puro overhead de stderr/fila
+        intervalo_progresso = max(1, total_frames // 100)
+        for i, (minutos, segundos, milissegundos) in enumerate(tqdm(tempos_frames, desc="Renomeando frames", unit="frame", mininterval=1.0, miniters=intervalo_progresso)):
+            nome_original_base = f"frame_{i+1:06d}.png"
+            nome_original = os.path.join(pasta_saida, nome_original_base)
+            nome_novo = os.path.join(pasta_saida, f"frame_{nome_base}_{minutos:02d}-{segundos:02d}-{milissegundos:03d}.png")
+
+            if nome_original_base in existentes:
+                os.replace(nome_original, nome_novo)
+            else:
+                logging.warning(f"Arquivo {nome_original} não encontrado. Pulando...")
+
+            if fila_progresso and ((i + 1) % intervalo_progresso == 0 or i + 1 == total_frames):
+                fila_progresso.put((i + 1) / total_frames)
+    except Exception as e:
+        logging.error(f"Erro ao renomear frames: {e}")
+        raise
+
+def processar_frames(caminho_video, pasta_saida, fila_progresso):
+    """Processa frames: extração e renomeação."""
+    try:
+        # Extrair nome base do vídeo
+        nome_base = os.path.splitext(os.path.basename(caminho_video))[0]
+
+        # Extrair frames
+        dados_log = extrair_frames(caminho_video, pasta_saida)
+        tempos_frames = analisar_dados_log(dados_log)
+
+        # Renomear frames, reportando o progresso pela própria passada
+        renomear_frames(tempos_frames, pasta_saida, nome_base, fila_progresso)
+        fila_progresso.put("Processamento de frames concluído!")
+    except Exception as e:
+        logging.error(f"Erro ao processar frames para {caminho_video}: {e}")
+        fila_progresso.put(f"Erro ao processar frames: {e}")
+
+
+# Cache do modelo de tradução no escopo do processo: dentro do worker
+# residente, o primeiro arquivo em inglês paga o carregamento e os
+# seguintes reutilizam o mesmo tokenizer e modelo
+_traducao_cache = None
+
+def obter_modelo_traducao(device):
+    """Carrega (uma única vez por processo) o tokenizer e o modelo M2M100."""
+    global _traducao_cache
+    if _traducao_cache is None:
+        # Modelo de tradução quantizado: fp16 na GPU corta pela metade o
+        # tráfego de memória do decode autoregressivo; na CPU o int8
+        # dinâmico nas camadas lineares dá o mesmo efeito
+        tokenizer = M2M100Tokenizer.from_pretrained("facebook/m2m100_418M")
+        if device == "cuda":
+            # device_map carrega os pesos direto na GPU já em fp16, sem
+            # materializar a cópia fp32 na RAM do host para depois transferir
+            translation_model = M2M100ForConditionalGeneration.from_pretrained("facebook/m2m100_1.2B", torch_dtype=torch.float16, device_map={"": device})
+            if hasattr(torch, "compile"):
+                # Captura de grafo e fusão de kernels; com a tradução em
+                # lote as formas estabilizam após as primeiras chamadas
+                translation_model = torch.compile(translation_model, mode="reduce-overhead", fullgraph=False)
+        else:
+            modelo_traducao = M2M100ForConditionalGeneration.from_pretrained("facebook/m2m100_1.2B")
+            translation_model = torch.quantization.quantize_dynamic(modelo_traducao, {torch.nn.Linear}, dtype=torch.qint8)
+        tokenizer.src_lang = "en"
+
+        if device == "cuda" and hasattr(torch, "compile"):
+            # Aquecer o grafo compilado para pagar o custo de compilação
+            # uma vez, fora do caminho dos segmentos reais
+            try:
+                aquecimento = tokenizer("warmup", return_tensors="pt").to(device)
+                translation_model.generate(**aquecimento, forced_bos_token_id=tokenizer.get_lang_id("pt"), max_new_tokens=4)
+            except Exception as e:
+                logging.debug(f"Aquecimento do torch.compile falhou: {e}")
+
+        _traducao_cache = (tokenizer, translation_model)
+    return _traducao_cache
+
+def escolher_compute_type(device):
+    """Escolhe o compute_type do Whisper conforme a capacidade do dispositivo."""
+    if device != "cuda":
+        return "int8"
+    if torch.cuda.get_device_capability(0) >= (7, 5):
+        # Pesos em int8 (metade da VRAM) com ativações fp16 nos tensor cores
+        return "int8_float16"
+    return "float16"
+
+def carregar_modelo_whisper(nome_modelo, device, compute_type="auto"):
+    """Carrega o WhisperModel uma única vez para ser reutilizado entre arquivos."""
+    if compute_type == "auto":
+        compute_type = escolher_compute_type(device)
+    try:
+        return WhisperModel(model_size_or_path=nome_modelo, device=device, compute_type=compute_type)
+    except ValueError:
+        # Tipo não suportado pelo dispositivo: deixar o CTranslate2 escolher
+        return WhisperModel(model_size_or_path=nome_modelo, device=device, compute_type="auto")
+
+def transcrever_audio_faster_whisper(caminho_audio, nome_modelo="large-v3", idioma=None, fila_progresso=None, beam_size=1, modelo_whisper=None):
+    """Transcreve áudio do vídeo ou arquivo MP3 usando o Faster-Whisper."""
+    modelo_proprio = modelo_whisper is None
+    try:
+        logging.info("Iniciando Transcrição do áudio usando o Faster-Whisper")
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        if modelo_proprio:
+            modelo_whisper = carregar_modelo_whisper(nome_modelo, device)
+        logging.debug(f"Modelo {nome_modelo} carregado com sucesso.")
+
+        base_path = caminho_audio.rsplit(".", 1)[0]
+        detected_language = None
+        arquivos = {}
+
+        # Iniciar transcrição e obter gerador de segmentos: uma única chamada
+        # a transcribe(); as chamadas extras para contar segmentos rodavam o
+        # modelo inteiro de novo, triplicando o custo da transcrição
+        # O decoder é o gargalo da transcrição: beam_size=1 (guloso) corta os
+        # FLOPs de decodificação ~5x frente ao beam de 5, e a lista de
+        # temperaturas mantém o fallback automático quando a saída degenera.
+        # condition_on_previous_text=False evita o crescimento do contexto em
+        # áudios longos
+        resultado = modelo_whisper.transcribe(
+            caminho_audio,
+            beam_size=beam_size,
+            best_of=1,
+            condition_on_previous_text=False,
+            temperature=[0.0, 0.2, 0.4],
+            language=idioma,
+            vad_filter=True,
+            vad_parameters={"min_silence_duration_ms": 500},
+        )
+        generator = resultado[0]
+        info = resultado[1]
+
+        detected_language = info.language
+        logging.info(f"Linguagem detectada: {detected_language}")
+
+        if detected_language == "en":
+            # Arquivos para transcrição em inglês e português, com buffer de
+            # 1 MiB: os 2-4 writes curtos por segmento viram poucas syscalls
+            arquivos['srt_en'] = open(f"{base_path}-en.srt", "w", encoding="utf-8", buffering=1 << 20)
+            arquivos['fala_cron_en'] = open(f"{base_path}-en-Fala.Cronometrada.txt", "w", encoding="utf-8", buffering=1 << 20)
+            arquivos['srt'] = open(f"{base_path}.srt", "w", encoding="utf-8", buffering=1 << 20)
+            arquivos['fala_cron'] = open(f"{base_path}-Fala.Cronometrada.txt", "w", encoding="utf-8", buffering=1 << 20)
+            # Modelo de tradução compartilhado do processo (carregado uma vez)
+            arquivos['tokenizer'], arquivos['translation_model'] = obter_modelo_traducao(device)
+        else:
+            # Arquivos para transcri��ão no idioma detectado
+            arquivos['srt'] = open(f"{base_path}.srt", "w", encoding="utf-8", buffering=1 << 20)
+            arquivos['fala_cron'] = open(f"{base_path}-Fala.Cronometrada.txt", "w", encoding="utf-8", buffering=1 << 20)
+
+        # Traduzir em lotes: uma chamada a generate() por lote de segmentos
+        # amortiza o custo fixo de lançamento de kernels e aproveita melhor a
+        # GPU do que uma chamada por frase
+        TAMANHO_LOTE_TRADUCAO = 16
+        lote_traducao = []
+
+        def descarregar_lote_traducao():
+            """Traduz o lote acumulado e grava os blocos SRT/txt em ordem."""
+            if not lote_traducao:
+                return
+            textos = [item[3] for item in lote_traducao]
+            encoded = arquivos['tokenizer'](textos, return_tensors="pt", padding=True, truncation=True)
+            if device == "cuda":
+                # Memória pinada + cópia assíncrona: a transferência
+                # host->GPU do lote sobrepõe com o trabalho já enfileirado
+                # em vez de bloquear em memória paginável
+                encoded = {chave: tensor.pin_memory().to(device, non_blocking=True) for chave, tensor in encoded.items()}
+            else:
+                encoded = encoded.to(device)
+            generated_tokens = arquivos['translation_model'].generate(**encoded, forced_bos_token_id=arquivos['tokenizer'].get_lang_id("pt"), num_beams=1, max_new_tokens=256)
+            textos_traduzidos = arquivos['tokenizer'].batch_decode(generated_tokens, skip_special_tokens=True)
+
+            for (sid, inicio, fim, texto), texto_traduzido in zip(lote_traducao, textos_traduzidos):
+                arquivos['srt'].write(f"{sid}\n")
+                arquivos['srt'].write(f"{formatar_timestamp(inicio)} --> {formatar_timestamp(fim)}\n")
+                arquivos['srt'].write(f"{texto_traduzido}\n\n")
+                arquivos['fala_cron'].write(f"{formatar_timestamp(inicio)}: {texto_traduzido}\n")
+
+                logging.info(f"Segmento {sid}: {formatar_timestamp(inicio)} --> {formatar_timestamp(fim)} {texto} | pt='{texto_traduzido}'")
+            lote_traducao.clear()
+
+        segment_id = 1
+        for segmento in generator:
+            inicio = segmento.start
+            fim = segmento.end
+            texto = segmento.text.strip()
+
+            if detected_language == "en":
+                # Salvar segmento em inglês
+                arquivos['srt_en'].write(f"{segment_id}\n")
+                arquivos['srt_en'].write(f"{formatar_timestamp(inicio)} --> {formatar_timestamp(fim)}\n")
+                arquivos['srt_en'].write(f"{texto}\n\n")
+                arquivos['fala_cron_en'].write(f"{formatar_timestamp(inicio)}: {texto}\n")
+
+                # Acumular para tradução em lote
+                lote_traducao.append((segment_id, inicio, fim, texto))
+                if len(lote_traducao) >= TAMANHO_LOTE_TRADUCAO:
+                    descarregar_lote_traducao()
+            else:
+                # Salvar segmento no idioma detectado
+                arquivos['srt'].write(f"{segment_id}\n")
+                arquivos['srt'].write(f"{formatar_timestamp(inicio)} --> {formatar_timestamp(fim)}\n")
+                arquivos['srt'].write(f"{texto}\n\n")
+                arquivos['fala_cron'].write(f"{formatar_timestamp(inicio)}: {texto}\n")
+
+                logging.info(f"Segmento {segment_id}: {formatar_timestamp(inicio)} --> {formatar_timestamp(fim)} {texto}")
+
+            if fila_progresso:
+                # Progresso pela posição do segmento na duração total do áudio
+                progress = min(1.0, fim / info.duration) if info.duration else 1.0
+                fila_progresso.put(progress)
+            segment_id += 1
+
+        # Traduzir o que restou no último lote
+        descarregar_lote_traducao()
+
+        # Fechar arquivos abertos
+        for arquivo in arquivos.values():
+            if hasattr(arquivo, 'close'):
+                arquivo.close()
+
+        logging.info("Arquivos de transcrição gerados.")
+    except Exception as e:
+        logging.error(f"Erro ao transcrever áudio para {caminho_audio}: {e}", exc_info=True)
+        raise
+    finally:
+        # Liberar recursos e limpar memória apenas quando o modelo foi
+        # carregado localmente; o modelo residente do worker é reutilizado
+        if modelo_proprio:
+            del modelo_whisper
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+            logging.info("Memória liberada após transcrição.")
+
+def salvar_transcricao(segmentos, caminho_srt, caminho_fala_cronometrada):
+    """Salva os segmentos transcritos em arquivos SRT e de Fala Cronometrada."""
+    try:
+        with open(caminho_srt, "w", encoding="utf-8") as arquivo_srt:
+            with open(caminho_fala_cronometrada, "w", encoding="utf-8") as arquivo_txt:
+                for segmento in segmentos:
+                    inicio = segmento.start
+                    fim = segmento.end
+                    texto = segmento.text.strip()
+
+                    logging.info(f"Salvando segmento {segmento.id} {formatar_timestamp(inicio)} --> {formatar_timestamp(fim)} {texto}")
+
+                    # Arquivo SRT
+                    arquivo_srt.write(f"{segmento.id}\n")
+                    arquivo_srt.write(f"{formatar_timestamp(inicio)} --> {formatar_timestamp(fim)}\n")
+                    arquivo_srt.write(f"{texto}\n\n")
+
+                    # Arquivo de texto Fala Cronometrada
+                    arquivo_txt.write(f"{formatar_timestamp(inicio)}: {texto}\n")
+    except Exception as e:
+        logging.error(f"Erro ao salvar transcrição: {e}", exc_info=True)
+        raise
+
+@functools.lru_cache(maxsize=8192)
+def _formatar_timestamp_ms(total_ms):
+    """Formata milissegundos inteiros no padrão SRT (resultado cacheado)."""
+    # Aritmética inteira sobre milissegundos: dois divmod, sem deriva de float
+    segs, milissegundos = divmod(total_ms, 1000)
+    minutos, segs = divmod(segs, 60)
+    horas, minutos = divmod(minutos, 60)
+    return f"{horas:02d}:{minutos:02d}:{segs:02d},{milissegundos:03d}"
+
+def formatar_timestamp(segundos):
+    """Formata segundos no formato de timestamp para SRT."""
+    # Arredondar para ms inteiros torna a entrada cacheável: cada timestamp
+    # é formatado várias vezes por segmento entre os arquivos de saída
+    return _formatar_timestamp_ms(int(round(segundos * 1000)))
+
+def whisper_worker(fila_tarefas, fila_progresso, fila_concluido, nome_modelo, beam_size=1, compute_type="auto"):
+    """Worker residente: carrega o modelo uma única vez e transcreve os
+    arquivos recebidos pela fila de tarefas até o sentinela None."""
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    if device == "cuda":
+        # Deixar ~30% da VRAM livre para o contexto de decode do ffmpeg
+        # (-hwaccel), que compartilha o mesmo dispositivo com a transcrição
+        try:
+            torch.cuda.set_per_process_memory_fraction(0.7, 0)
+        except Exception as e:
+            logging.debug(f"Não foi possível limitar a fração de memória CUDA: {e}")
+    modelo_whisper = carregar_modelo_whisper(nome_modelo, device, compute_type)
+    logging.debug(f"Modelo {nome_modelo} residente no worker de transcrição.")
+
+    for caminho_arquivo in iter(fila_tarefas.get, None):
+        try:
+            transcrever_audio_faster_whisper(caminho_arquivo, nome_modelo=nome_modelo, fila_progresso=fila_progresso, beam_size=beam_size, modelo_whisper=modelo_whisper)
+            fila_progresso.put("Transcrição de áudio concluída!")
+        except Exception as e:
+            logging.error(f"Erro no processo de transcrição: {e}", exc_info=True)
+            fila_progresso.put(f"Erro na transcrição: {e}")
+        fila_concluido.put(caminho_arquivo)
+
+
+def encontrar_arquivos_mascara(mascara, recursivo):
+    """Gera os caminhos que casam com a máscara, um por vez, via os.scandir.
+
+    Ao contrário do glob recursivo, não materializa a lista inteira antes de
+    começar: o primeiro arquivo entra no pipeline enquanto a varredura do
+    restante da árvore continua.
+    """
+    pasta_base, nome_mascara = os.path.split(mascara)
+    pasta_base = pasta_base or "."
+    # Compilar a máscara uma única vez
+    padrao = re.compile(fnmatch.translate(nome_mascara))
+
+    def _caminhar(pasta):
+        try:
+            with os.scandir(pasta) as entradas:
+                for entrada in entradas:
+                    if entrada.is_dir(follow_symlinks=False):
+                        if recursivo:
+                            yield from _caminhar(entrada.path)
+                    elif padrao.match(entrada.name):
+                        yield entrada.path
+        except OSError as e:
+            logging.error(f"Erro ao listar a pasta {pasta}: {e}")
+
+    yield from _caminhar(pasta_base)
+
+def formatar_tempo_humano(tempo_segundos):
+    """Formata o tempo em horas, minutos e segundos."""
+    horas = int(tempo_segundos // 3600)
+    minutos = int((tempo_segundos % 3600) // 60)
+    segundos = int(tempo_segundos % 60)
+    
+    partes = []
+    if horas > 0:
+        partes.append(f"{horas} horas")
+    if minutos > 0:
+        partes.append(f"{minutos} minutos")
+    if segundos > 0 or not partes:
+        partes.append(f"{segundos} segundos")
+    
+    return ", ".join(partes)
+
+
+def main():
+    # Relógio monotônico capturado aqui e passado adiante explicitamente,
+    # em vez de lido como global definido no bloco __main__
+    tempo_inicio = perf_counter()
+
+    parser = argparse.ArgumentParser(description="Processa vídeos e áudios para extrair frames e gerar legendas com Faster-Whisper.")
+    parser.add_argument("mascara_arquivos", type=str, nargs='?', help="Máscara de arquivos para processamento (ex: *.mp4, *.mp3).")
+    parser.add_argument("--modelo", type=str, default="large-v3", help="Modelo Whisper a ser utilizado (padrão: small).")
+    parser.add_argument("--recursivo", action="store_true", help="Busca recursivamente em subdiretórios.")
+    parser.add_argument("--pasta_saida", type=str, help="Pasta de saída para armazenar frames.")
+    parser.add_argument("--desativar-frames", action="store_true", help="Desativa o processamento de frames.")
+    parser.add_argument("--skip-transcricao", action="store_true", help="Pula o processo de transcrição.")
+    parser.add_argument("--skip-prontos", action="store_true", help="Pula arquivos já processados com '-Fala.Cronometrada.txt' maior que 1KB.")
+    parser.add_argument("--beam-size", type=int, default=1, help="Largura do beam search do Whisper (padrão: 1, decodificação gulosa).")
+    parser.add_argument("--compute-type", type=str, default="auto", help="compute_type do CTranslate2 (padrão: auto — int8_float16 em GPUs sm75+, float16 em GPUs antigas, int8 em CPU).")
+    
+    # Add new argument --no-interactive
+    parser.add_argument("--no-interactive", action="store_true", help="Executa o programa sem a interface gráfica.")
+
+    args = parser.parse_args()
+
+    if not args.no_interactive:
+        # If --no-interactive is not specified, show GUI to get parameters
+
+        def submit_parameters():
+            args.mascara_arquivos = entry_mascara_arquivos.get()
+            args.modelo = entry_modelo.get()
+            args.recursivo = var_recursivo.get()
+            args.pasta_saida = entry_pasta_saida.get() if entry_pasta_saida.get() else None
+            args.desativar_frames = var_desativar_frames.get()
+            args.skip_prontos = var_skip_prontos.get()
+            args.skip_transcricao = var_skip_transcricao.get()
+            root.destroy()
+
+        # Alterar o tema da janela principal
+        root = ThemedTk(theme="radiance")  # Novo tema para a janela de configuração
+        root.title("Configurações do Programa")
+        style = ttk.Style(root)
+        style.theme_use('radiance')  # Aplicar o novo tema
+
+        # Input fields for parameters
+        tk.Label(root, text="Máscara de Arquivos:").grid(row=0, column=0, sticky="e")
+        entry_mascara_arquivos = tk.Entry(root, width=50)
+        entry_mascara_arquivos.grid(row=0, column=1)
+        entry_mascara_arquivos.insert(0, args.mascara_arquivos if args.mascara_arquivos else "*.mp4")
+
+        tk.Label(root, text="Modelo Whisper:").grid(row=1, column=0, sticky="e")
+        entry_modelo = tk.Entry(root, width=50)
+        entry_modelo.grid(row=1, column=1)
+        entry_modelo.insert(0, args.modelo)
+
+        var_recursivo = tk.BooleanVar(value=args.recursivo)
+        tk.Checkbutton(root, text="Busca Recursiva", variable=var_recursivo).grid(row=2, column=1, sticky="w")
+
+        tk.Label(root, text="Pasta de Saída:").grid(row=3, column=0, sticky="e")
+        entry_pasta_saida = tk.Entry(root, width=50)
+        entry_pasta_saida.grid(row=3, column=1)
+        if args.pasta_saida:
+            entry_pasta_saida.insert(0, args.pasta_saida)
+
+        var_desativar_frames = tk.BooleanVar(value=args.desativar_frames)
+        tk.Checkbutton(root, text="Desativar Frames", variable=var_desativar_frames).grid(row=4, column=1, sticky="w")
+
+        var_skip_prontos = tk.BooleanVar(value=args.skip_prontos)
+        tk.Checkbutton(root, text="Pular Arquivos Prontos", variable=var_skip_prontos).grid(row=5, column=1, sticky="w")
+        
+        var_skip_transcricao = tk.BooleanVar(value=args.skip_transcricao if hasattr(args, 'skip_transcricao') else False)
+        tk.Checkbutton(root, text="Pular Transcrição", variable=var_skip_transcricao).grid(row=6, column=1, sticky="w")
+        
+        # Ajuste o número da linha para o botão "Iniciar"
+        tk.Button(root, text="Iniciar", command=submit_parameters).grid(row=7, column=1)
+
+        root.mainloop()
+
+    # Criar a janela de progresso com o novo tema
+    progress_root = ThemedTk(theme="radiance")  # Novo tema para a janela de progresso
+    progress_root.title("Progresso")
+    style = ttk.Style(progress_root)
+    style.theme_use('radiance')  # Aplicar o novo tema
+
+    # Elementos da GUI
+    tk.Label(progress_root, text="Arquivo Atual:").grid(row=0, column=0, sticky="w")
+    arquivo_label = tk.Label(progress_root, text="", font=("Arial", 12, "bold"))
+    arquivo_label.grid(row=0, column=1, sticky="w")
+
+    tk.Label(progress_root, text="Processamento de Frames:").grid(row=1, column=0, sticky="w")
+    progress_bar_frames = ttk.Progressbar(progress_root, length=400)
+    progress_bar_frames.grid(row=1, column=1)
+
+    tk.Label(progress_root, text="Transcrição de Áudio:").grid(row=2, column=0, sticky="w")
+    progress_bar_transcricao = ttk.Progressbar(progress_root, length=400)
+    progress_bar_transcricao.grid(row=2, column=1)
+
+    tk.Label(progress_root, text="Logs:").grid(row=3, column=0, sticky="nw")
+    log_label = tk.Label(progress_root, text="", justify="left", anchor="w")
+    log_label.grid(row=3, column=1, sticky="w")
+
+    # Custom logging handler to update GUI label
+    class TkinterHandler(logging.Handler):
+        def __init__(self, label):
+            super().__init__()
+            self.label = label
+
+        def emit(self, record):
+            msg = self.format(record)
+            level = record.levelname
+            message = f"[{level}] {msg}"
+            self.label.config(text=message)
+            self.label.update_idletasks()
+            self.label.update_idletasks()
+
+    logger = logging.getLogger()
+
+    # Do not remove existing handlers
+    # Remove the loop that removes existing handlers
+    # for handler in logger.handlers[:]:
+    #     logger.removeHandler(handler)
+
+    # Add the TkinterHandler to the logger
+    logger.addHandler(TkinterHandler(log_label))
+
+    # Set the logging level as needed
+    logger.setLevel(logging.DEBUG)
+
+    # Filas para monitorar progresso
+    fila_progresso_transcricao = Queue()
+    fila_progresso_frames = Queue()
+    fila_progresso_arquivo = Queue()  # Nova fila para o arquivo atual
+
+    # Função para atualizar a GUI periodicamente
+    def update_gui():
+        # Atualizar o nome do arquivo atual
+        if not fila_progresso_arquivo.empty():
+            current_file = fila_progresso_arquivo.get()
+            arquivo_label.config(text=current_file)
+
+        # Check progress queues
+        if not fila_progresso_frames.empty():
+            msg_frames = fila_progresso_frames.get()
+            if isinstance(msg_frames, float):
+                progress_bar_frames['value'] = msg_frames * 100
+            else:
+                log_label.config(text=msg_frames)
+
+        if not fila_progresso_transcricao.empty():
+            msg_transcricao = fila_progresso_transcricao.get()
+            if isinstance(msg_transcricao, float):
+                progress_bar_transcricao['value'] = msg_transcricao * 100
+            else:
+                log_label.config(text=msg_transcricao)
+
+        # Schedule next check
+        progress_root.after(100, update_gui)
+
+    # Start updating the GUI
+    update_gui()
+
+    # Start processing in a separate thread to avoid blocking the GUI
+    processing_thread = threading.Thread(target=process_files, args=(args, fila_progresso_transcricao, fila_progresso_frames, fila_progresso_arquivo, tempo_inicio))
+    processing_thread.start()
+
+    # Start the main event loop
+    progress_root.mainloop()
+
+def process_files(args, fila_progresso_transcricao, fila_progresso_frames, fila_progresso_arquivo, tempo_inicio):
+    # Verificar se GPU está disponível
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    logging.debug(f"Usando dispositivo: {device}")
+
+    if device == "cuda":
+        # Resetar o dispositivo CUDA
+        torch.cuda.empty_cache()
+        torch.cuda.reset_peak_memory_stats()
+
+    # Worker único de transcrição: o modelo Whisper é carregado uma vez e
+    # reutilizado para todos os arquivos, em vez de um spawn por vídeo
+    if not args.skip_transcricao:
+        fila_tarefas_transcricao = Queue()
+        fila_concluido_transcricao = Queue()
+        processo_transcricao = Process(target=whisper_worker, args=(fila_tarefas_transcricao, fila_progresso_transcricao, fila_concluido_transcricao, args.modelo, args.beam_size, args.compute_type))
+        processo_transcricao.start()
+
+    # Usar a pasta do arquivo processado se pasta_saida não for fornecida
+    for caminho_arquivo in encontrar_arquivos_mascara(args.mascara_arquivos, args.recursivo):
+        try:
+            # Enviar o nome do arquivo atual para a fila
+            fila_progresso_arquivo.put(caminho_arquivo)
+
+            # Verificar se o arquivo correspondente de fala cronometrada já existe e tem mais de 1KB
+            caminho_fala_cronometrada = caminho_arquivo.replace(".mp4", "-Fala.Cronometrada.txt").replace(".mp3", "-Fala.Cronometrada.txt")
+
+            if args.skip_prontos and os.path.exists(caminho_fala_cronometrada) and os.path.getsize(caminho_fala_cronometrada) > 1024:
+                logging.info(f"Pulado: '{caminho_arquivo}', arquivo de fala cronometrada '{caminho_fala_cronometrada}' já existe e é maior que 1KB.")
+                continue  # Pular para o próximo arquivo
+
+            if args.pasta_saida:
+                pasta_saida = args.pasta_saida
+            else:
+                pasta_saida = os.path.dirname(caminho_arquivo)  # mesma pasta do arquivo processado
+
+            pasta_saida = os.path.join(pasta_saida, os.path.splitext(os.path.basename(caminho_arquivo))[0])
+            os.makedirs(pasta_saida, exist_ok=True)
+
+            logging.info(f"Processando arquivo: {caminho_arquivo}")
+            logging.info(f"Pasta de saída: {pasta_saida}")
+
+            if not args.skip_transcricao:
+                # Enfileirar o arquivo para o worker residente de transcrição
+                fila_tarefas_transcricao.put(caminho_arquivo)
+            else:
+                logging.info("Processo de transcrição pulado.")
+
+            # Iniciar processo de frames apenas se não estiver desativado e for um vídeo
+            if not args.desativar_frames and caminho_arquivo.endswith(".mp4"):
+                # Thread em vez de Process: o trabalho pesado é do subprocesso
+                # ffmpeg, que já roda em paralelo fora do GIL, então o spawn de
+                # um interpretador inteiro por arquivo só adicionava custo
+                processo_frames = threading.Thread(target=processar_frames, args=(caminho_arquivo, pasta_saida, fila_progresso_frames))
+                processo_frames.start()
+            else:
+                logging.info("Processamento de frames desativado ou não aplicável.")
+
+            # Monitorar progresso com get bloqueante em vez de polling com empty()
+            transcricao_pendente = not args.skip_transcricao
+            while (transcricao_pendente or
+                   (not args.desativar_frames and caminho_arquivo.endswith(".mp4") and processo_frames.is_alive())):
+                if not args.desativar_frames and caminho_arquivo.endswith(".mp4"):
+                    try:
+                        msg_frames = fila_progresso_frames.get(timeout=0.5)
+                        logging.info(f"Frames: {msg_frames}")
+                    except Empty:
+                        pass
+
+                if transcricao_pendente:
+                    try:
+                        fila_concluido_transcricao.get(timeout=0.5)
+                        transcricao_pendente = False
+                    except Empty:
+                        pass
+
+            # Garantir que o processo de frames foi concluído
+            if not args.desativar_frames and caminho_arquivo.endswith(".mp4"):
+                processo_frames.join()
+
+        except Exception as e:
+            logging.error(f"Erro ao processar arquivo {caminho_arquivo}: {e}")
+
+    # Encerrar o worker de transcrição
+    if not args.skip_transcricao:
+        fila_tarefas_transcricao.put(None)
+        processo_transcricao.join()
+
+    tempo_total = perf_counter() - tempo_inicio
+    tempo_formatado = formatar_tempo_humano(tempo_total)
+    logging.info(f"Processo concluído em {tempo_formatado}.")
+
+if __name__ == "__main__":
+    main()
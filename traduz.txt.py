@@ -1,57 +1,347 @@
 import argparse
+import hashlib
+import mmap
 import os
+import random
+import time
+import re
 import glob
-from translate import Translator
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import sqlite3
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from tqdm import tqdm
 
+# Cache de traduções do processo: arquivos VTT repetem muitas linhas
+# (refrões, tags de falante), e cada repetição evitada é uma viagem HTTPS a menos
+_cache_traducoes = {}
+_cache_lock = threading.Lock()
+
+# Sessão HTTP única com pool de conexões compartilhado por todas as threads
+# e todos os arquivos: o wrapper `translate` abria uma conexão por chamada
+_sessao_http = requests.Session()
+_sessao_http.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+_MYMEMORY_URL = "https://api.mymemory.translated.net/get"
+
+# Motor de tradução local opcional (--offline): elimina a rede por completo
+# quando o argostranslate e o modelo de idioma estão instalados
+_motor_offline = None
+
+def configurar_motor_offline(target_lang, source_lang="en"):
+    """Ativa o Argos Translate local, se o pacote e o modelo estiverem instalados."""
+    global _motor_offline
+    try:
+        import argostranslate.translate as argos
+    except ImportError:
+        print("argostranslate não instalado; usando a API HTTP.")
+        return
+
+    idiomas = argos.get_installed_languages()
+    origem = next((idioma for idioma in idiomas if idioma.code == source_lang), None)
+    destino = next((idioma for idioma in idiomas if idioma.code == target_lang), None)
+    if origem and destino:
+        _motor_offline = origem.get_translation(destino)
+        print("Tradução offline (Argos Translate) ativada.")
+    else:
+        print(f"Modelo Argos {source_lang}->{target_lang} não instalado; usando a API HTTP.")
+
+# Pausa global de rate limit: ao receber um 429, uma thread sinaliza e todas
+# esperam a janela de backoff em vez de continuar martelando a API
+_pausa_rate_limit = threading.Event()
+_pausa_rate_limit.set()
+_TENTATIVAS_HTTP = 5
+
+def _traduzir_texto(texto, target_lang, source_lang="en"):
+    """Traduz pelo motor offline quando ativo, senão pela API MyMemory."""
+    if _motor_offline is not None:
+        return _motor_offline.translate(texto)
+    for tentativa in range(_TENTATIVAS_HTTP):
+        _pausa_rate_limit.wait()
+        try:
+            resposta = _sessao_http.get(
+                _MYMEMORY_URL,
+                params={"q": texto, "langpair": f"{source_lang}|{target_lang}"},
+                timeout=30,
+            )
+            resposta.raise_for_status()
+            dados = resposta.json()
+            # A MyMemory devolve erros dentro de um HTTP 200 (responseStatus
+            # 403, cota esgotada etc.); sem esta checagem o texto do erro
+            # seria devolvido — e persistido no tm.sqlite — como "tradução"
+            if str(dados.get("responseStatus")) != "200" or dados.get("quotaFinished"):
+                raise requests.HTTPError(
+                    f"MyMemory recusou a tradução ({dados.get('responseStatus')}): "
+                    f"{dados.get('responseDetails')}",
+                    response=resposta,
+                )
+            return dados["responseData"]["translatedText"]
+        except (requests.HTTPError, requests.ConnectionError, requests.Timeout) as e:
+            if tentativa == _TENTATIVAS_HTTP - 1:
+                raise
+            # Backoff exponencial com jitter: 0,5s, 1s, 2s... até 30s
+            espera = min(30, 0.5 * (2 ** tentativa)) * (1 + random.random())
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            if status == 429:
+                # Pausa todas as threads até o fim da janela de backoff
+                _pausa_rate_limit.clear()
+                print(f"API limitou as requisições (429); pausando {espera:.1f}s...")
+                time.sleep(espera)
+                _pausa_rate_limit.set()
+            else:
+                time.sleep(espera)
+
+# Memória de tradução persistente em sqlite: rodar de novo sobre arquivos
+# (ou trechos) já vistos custa um SELECT em vez de uma chamada de tradução
+_TM_CAMINHO = "tm.sqlite"
+_tm_conn = None
+_tm_lock = threading.Lock()
+_tm_novos = []  # pares (chave, tradução) gravados em lote por arquivo
+
+def _tm_conectar():
+    global _tm_conn
+    if _tm_conn is None:
+        _tm_conn = sqlite3.connect(_TM_CAMINHO, check_same_thread=False)
+        # WAL: leituras e escritas concorrentes das threads de tradução
+        _tm_conn.execute("PRAGMA journal_mode=WAL")
+        _tm_conn.execute("CREATE TABLE IF NOT EXISTS tm(k BLOB PRIMARY KEY, v TEXT)")
+        _tm_conn.commit()
+    return _tm_conn
+
+def _tm_chave(texto, target_lang):
+    return hashlib.sha1(f"{target_lang}\0{texto}".encode("utf-8")).digest()
+
+def _tm_buscar(texto, target_lang):
+    with _tm_lock:
+        linha = _tm_conectar().execute("SELECT v FROM tm WHERE k = ?", (_tm_chave(texto, target_lang),)).fetchone()
+    return linha[0] if linha else None
+
+def _tm_acumular(texto, target_lang, traducao):
+    with _tm_lock:
+        _tm_novos.append((_tm_chave(texto, target_lang), traducao))
+
+def _tm_descarregar():
+    """Grava de uma vez (executemany) as traduções acumuladas."""
+    with _tm_lock:
+        if not _tm_novos:
+            return
+        conn = _tm_conectar()
+        conn.executemany("INSERT OR IGNORE INTO tm(k, v) VALUES (?, ?)", _tm_novos)
+        conn.commit()
+        _tm_novos.clear()
+
+# Detecção de metadado em um único regex compilado: linha em branco,
+# bloco NOTE ou timestamp de cue
+_META_RE = re.compile(r'^\s*$|^\s*NOTE|-->')
+# Variante em bytes para classificar as linhas direto do mmap, sem decodificar
+_META_RE_B = re.compile(rb'^\s*$|^\s*NOTE|-->')
+
 def is_metadata(line):
     """Verifica se a linha é metadado (timestamps ou outros)."""
-    return line.strip().startswith("NOTE") or "-->" in line or line.strip() == ""
+    return _META_RE.search(line) is not None
 
 def translate_line(line, target_lang):
-    """Traduz uma única linha usando a biblioteca translate."""
-    translator = Translator(to_lang=target_lang)
+    """Traduz uma única linha, com caches e retentativas."""
     try:
         if line.strip() and not is_metadata(line):  # Traduz apenas conteúdo falado
-            return translator.translate(line.strip())
+            chave = (target_lang, line.strip())
+            with _cache_lock:
+                if chave in _cache_traducoes:
+                    return _cache_traducoes[chave]
+
+            traducao = _tm_buscar(line.strip(), target_lang)
+            if traducao is None:
+                traducao = _traduzir_texto(line.strip(), target_lang)
+                _tm_acumular(line.strip(), target_lang, traducao)
+
+            with _cache_lock:
+                _cache_traducoes[chave] = traducao
+            return traducao
         else:
             return line  # Retorna a linha original se for metadado
     except Exception as e:
         print(f"Erro ao traduzir a linha: {line}. Erro: {e}")
         return line  # Retorna a linha original em caso de erro
 
-def translate_file(input_file, output_file, target_lang, processes):
+# Orçamento de caracteres por requisição: amortiza a latência de cada chamada
+# HTTP sobre várias linhas, mas sem estourar o limite de ~500 caracteres que a
+# MyMemory impõe ao parâmetro q (um lote rejeitado cai no fallback linha a
+# linha e sai mais caro do que nenhum lote)
+ORCAMENTO_LOTE = 450
+_SEPARADOR_LOTE = "\n|||\n"
+
+def translate_chunk(linhas, target_lang):
+    """Traduz um lote de linhas em uma única chamada, com fallback linha a linha."""
+    # Servir do cache o que já foi visto; só os misses vão para a rede
+    resultados = [None] * len(linhas)
+    pendentes = []
+    with _cache_lock:
+        for pos, linha in enumerate(linhas):
+            chave = (target_lang, linha)
+            if chave in _cache_traducoes:
+                resultados[pos] = _cache_traducoes[chave]
+            else:
+                pendentes.append(pos)
+
+    # Consultar a memória persistente antes de ir para a rede
+    if pendentes:
+        ainda_pendentes = []
+        for pos in pendentes:
+            traducao = _tm_buscar(linhas[pos], target_lang)
+            if traducao is None:
+                ainda_pendentes.append(pos)
+            else:
+                resultados[pos] = traducao
+                with _cache_lock:
+                    _cache_traducoes[(target_lang, linhas[pos])] = traducao
+        pendentes = ainda_pendentes
+
+    if pendentes:
+        try:
+            traduzido = _traduzir_texto(_SEPARADOR_LOTE.join(linhas[pos] for pos in pendentes), target_lang)
+            partes = [parte.strip() for parte in traduzido.split("|||")]
+            if len(partes) != len(pendentes):
+                raise ValueError("o serviço não preservou o separador do lote")
+            with _cache_lock:
+                for pos, parte in zip(pendentes, partes):
+                    resultados[pos] = parte
+                    _cache_traducoes[(target_lang, linhas[pos])] = parte
+            for pos, parte in zip(pendentes, partes):
+                _tm_acumular(linhas[pos], target_lang, parte)
+        except Exception as e:
+            print(f"Erro ao traduzir lote ({e}); refazendo linha a linha.")
+            for pos in pendentes:
+                resultados[pos] = translate_line(linhas[pos], target_lang)
+
+    return resultados
+
+def translate_file(input_file, output_file, target_lang, processes, executor):
     """Traduz o conteúdo de um arquivo de texto ou `.vtt` e salva em outro arquivo."""
     try:
         print(f"Processando o arquivo: {input_file}")
-        
-        # Lê o conteúdo do arquivo de entrada
-        with open(input_file, 'r', encoding='utf-8') as infile:
-            content = infile.readlines()
-
-        # Traduz as linhas em paralelo com uma barra de progresso
-        translated_lines = []
-        with ThreadPoolExecutor(max_workers=processes) as executor:
-            futures = {executor.submit(translate_line, line, target_lang): idx for idx, line in enumerate(content)}
-
-            with tqdm(total=len(futures), desc=f"Traduzindo {input_file}", unit="linha") as progress:
-                for future in as_completed(futures):
-                    idx = futures[future]
-                    try:
-                        translated_lines.append((idx, future.result()))
-                    except Exception as e:
-                        print(f"Erro ao processar a linha {idx}: {e}")
-                    progress.update(1)
-
-        # Ordena as linhas traduzidas para preservar a ordem original
-        translated_lines.sort(key=lambda x: x[0])
-        translated_content = "\n".join([line for _, line in translated_lines])
-
-        # Salva o texto traduzido no arquivo de saída
-        with open(output_file, 'w', encoding='utf-8') as outfile:
-            outfile.write(translated_content)
-        
+
+        # mmap do arquivo de entrada: as linhas viram fatias (memoryview) do
+        # mapeamento, sem copiar o arquivo inteiro para a memória do processo
+        infile = open(input_file, 'rb')
+        tamanho = os.fstat(infile.fileno()).st_size
+        if tamanho == 0:  # mmap rejeita arquivos vazios
+            infile.close()
+            open(output_file, 'wb').close()
+            print(f"Tradução do arquivo '{input_file}' concluída. Salvo em: {output_file}\n")
+            return
+        mapa = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        visao = memoryview(mapa)
+        content = []
+        inicio = 0
+        while inicio < tamanho:
+            fim = mapa.find(b"\n", inicio)
+            fim = tamanho - 1 if fim == -1 else fim
+            content.append(visao[inicio:fim + 1])
+            inicio = fim + 1
+
+        # Pré-passada: metadados ficam como estão (bytes intocados); só o
+        # conteúdo falado é decodificado e vai para tradução, agrupado em lotes
+        translated = list(content)
+        trabalho = []
+        for idx, linha in enumerate(content):
+            if _META_RE_B.search(linha) is None:
+                texto = bytes(linha).decode('utf-8').strip()
+                if texto:
+                    trabalho.append((idx, texto))
+                    translated[idx] = None  # pendente de tradução
+
+        # Deduplicação antes de submeter: cada texto único é traduzido uma vez
+        # e replicado em todos os índices onde aparece (refrões, falas repetidas)
+        unicos = {}
+        for idx, texto in trabalho:
+            unicos.setdefault(texto, []).append(idx)
+        fila_unicos = list(unicos.items())
+
+        # Montar lotes pelo orçamento de caracteres, não por contagem de
+        # linhas; uma linha maior que o orçamento viaja sozinha
+        lotes = []
+        lote_atual = []
+        tamanho_atual = 0
+        for texto, indices in fila_unicos:
+            custo = len(texto) + (len(_SEPARADOR_LOTE) if lote_atual else 0)
+            if lote_atual and tamanho_atual + custo > ORCAMENTO_LOTE:
+                lotes.append(lote_atual)
+                lote_atual = []
+                tamanho_atual = len(texto)
+            else:
+                tamanho_atual += custo
+            lote_atual.append((texto, indices))
+        if lote_atual:
+            lotes.append(lote_atual)
+
+        # Concorrência proporcional ao trabalho real (textos únicos): um
+        # arquivo de 20 linhas não precisa ocupar o pool, e --processes é o teto
+        limite_voo = min(processes, max(2, len(fila_unicos) // 8))
+
+        # Gravação incremental: um cursor avança gravando cada linha pronta em
+        # ordem, em vez de acumular tudo, ordenar e montar uma string gigante
+        with open(output_file, 'wb') as outfile:
+            proximo_gravar = 0
+
+            def drenar():
+                # Cada slot já carrega o terminador de linha original: nada de
+                # juntar com "\n", que duplicava as quebras vindas do readlines
+                nonlocal proximo_gravar
+                while proximo_gravar < len(translated) and translated[proximo_gravar] is not None:
+                    outfile.write(translated[proximo_gravar])
+                    translated[proximo_gravar] = None  # liberar a memória da linha gravada
+                    proximo_gravar += 1
+
+            # Traduz os lotes em paralelo com uma barra de progresso, usando o
+            # pool de tradução compartilhado entre os arquivos
+            with tqdm(total=len(trabalho), desc=f"Traduzindo {input_file}", unit="linha") as progress:
+                pendentes = {}
+
+                def consumir(futures_prontos):
+                    for future in futures_prontos:
+                        lote = pendentes.pop(future)
+                        try:
+                            resultados = future.result()
+                            for (_, indices), resultado in zip(lote, resultados):
+                                codificado = resultado.encode('utf-8')
+                                for idx in indices:
+                                    # Repor o terminador original de cada linha
+                                    terminador = b"\n" if content[idx][-1:] == b"\n" else b""
+                                    translated[idx] = codificado + terminador
+                        except Exception as e:
+                            print(f"Erro ao processar um lote de linhas: {e}")
+                            # Manter as linhas originais para não travar o cursor
+                            for _, indices in lote:
+                                for idx in indices:
+                                    translated[idx] = content[idx]
+                        progress.update(sum(len(indices) for _, indices in lote))
+                    drenar()
+
+                # Submissão limitada: no máximo 2x o limite calculado em voo,
+                # em vez de materializar todos os futures de uma vez
+                for lote in lotes:
+                    if len(pendentes) >= limite_voo * 2:
+                        feitos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+                        consumir(feitos)
+                    pendentes[executor.submit(translate_chunk, [texto for texto, _ in lote], target_lang)] = lote
+
+                consumir(as_completed(list(pendentes)))
+
+            # Gravar o que restar (arquivos só de metadados, cauda do cursor)
+            drenar()
+
+        # Soltar as fatias antes de fechar o mapeamento (mmap com visões
+        # exportadas não fecha)
+        content.clear()
+        translated.clear()
+        del linha
+        visao.release()
+        mapa.close()
+        infile.close()
+
+        # Persistir as traduções novas deste arquivo de uma vez
+        _tm_descarregar()
+
         print(f"Tradução do arquivo '{input_file}' concluída. Salvo em: {output_file}\n")
     except Exception as e:
         print(f"Erro ao processar o arquivo '{input_file}': {e}\n")
@@ -64,11 +354,21 @@ def process_files(input_mask, target_lang, processes):
         return
 
     print(f"Encontrados {len(files)} arquivos para tradução.\n")
-    for input_file in files:
-        # Gera o nome do arquivo de saída com o sufixo -pt.BR
-        base, ext = os.path.splitext(input_file)
-        output_file = f"{base}-pt.BR{ext}"
-        translate_file(input_file, output_file, target_lang, processes)
+
+    # Um único pool de tradução para a corrida inteira, alimentado por vários
+    # arquivos ao mesmo tempo: em arquivos curtos, um pool por arquivo deixava
+    # a maioria dos workers ociosa esperando o próximo arquivo
+    with ThreadPoolExecutor(max_workers=processes) as executor_traducao:
+        with ThreadPoolExecutor(max_workers=min(4, len(files))) as executor_arquivos:
+            tarefas = []
+            for input_file in files:
+                # Gera o nome do arquivo de saída com o sufixo -pt.BR
+                base, ext = os.path.splitext(input_file)
+                output_file = f"{base}-pt.BR{ext}"
+                tarefas.append(executor_arquivos.submit(translate_file, input_file, output_file, target_lang, processes, executor_traducao))
+
+            for tarefa in as_completed(tarefas):
+                tarefa.result()
 
     print("Processamento de todos os arquivos concluído!")
 
@@ -77,8 +377,12 @@ def main():
     parser.add_argument('input_mask', help="Máscara para os arquivos de entrada (ex: 'textos/*.vtt').")
     parser.add_argument('--target-lang', default='pt', help="Idioma de destino (padrão: pt).")
     parser.add_argument('--processes', type=int, default=8, help="Número de threads paralelas por arquivo (padrão: 8).")
+    parser.add_argument('--offline', action="store_true", help="Usa o Argos Translate local em vez da API HTTP, se disponível.")
     args = parser.parse_args()
 
+    if args.offline:
+        configurar_motor_offline(args.target_lang)
+
     process_files(args.input_mask, args.target_lang, args.processes)
 
 if __name__ == "__main__":